@@ -1,245 +1,392 @@
+import functools
 import streamlit as st   
-import geopandas as gpd
 import pandas as pd
-import pydeck as pdk
-from living_wage import living_wage_table  # your living wage table function or variable
-from breakdown import living_wage_breakdown  # your living wage breakdown functionn
-
-st.set_page_config(page_title="Fort Worth Living Wage Explorer", layout="wide")
-st.title("🏠 Fort Worth Living Wage Housing Affordability Explorer")
-
-# ---------- Sidebar Inputs ----------
-st.sidebar.header("User Inputs")
-
-family_type_options = [
-    "1 Adult", "1 Adult 1 Child", "1 Adult 2 Children", "1 Adult 3 Children",
-    "2 Adults (1 Working)", "2 Adults (1 Working) 1 Child", "2 Adults (1 Working) 2 Children", "2 Adults (1 Working) 3 Children",
-    "2 Adults (2 Working)", "2 Adults (2 Working) 1 Child", "2 Adults (2 Working) 2 Children", "2 Adults (2 Working) 3 Children"
-]
-family_type = st.sidebar.selectbox("Select your family type", family_type_options)
-bedroom_options = {
-    "All Units": "median_rent_all",
-    "Studio (0 BR)": "median_rent_0br",
-    "1 Bedroom": "median_rent_1br",
-    "2 Bedrooms": "median_rent_2br",
-    "3 Bedrooms": "median_rent_3br",
-    "4+ Bedrooms": "median_rent_4br"
-}
-bedroom_label = st.sidebar.selectbox("Number of Bedrooms", list(bedroom_options.keys()))
-bedroom_col = bedroom_options[bedroom_label]
-
-
-st.sidebar.markdown("###  Monthly Cost Inputs")
-
-housing_input = st.sidebar.number_input("Housing ($/mo)", min_value=500, max_value=5000, value=1450)
-food_input = st.sidebar.number_input("Food ($/mo)", min_value=100, max_value=2000, value=350)
-childcare_input = st.sidebar.number_input("Child Care ($/mo)", min_value=0, max_value=3000, value=800)
-transport_input = st.sidebar.number_input("Transportation ($/mo)", min_value=50, max_value=1500, value=400)
-health_input = st.sidebar.number_input("Health Care ($/mo)", min_value=50, max_value=1500, value=160)
-other_input = st.sidebar.number_input("Other Necessities ($/mo)", min_value=50, max_value=1500, value=300)
-civic_input = st.sidebar.number_input("Civic Engagement ($/mo)", min_value=0, max_value=1000, value=170)
-internet_input = st.sidebar.number_input("Internet ($/mo)", min_value=0, max_value=500, value=90)
-taxes_input = st.sidebar.number_input("Taxes ($/mo)", min_value=0, max_value=3000, value=500)
-
-# Calculate total living wage based on custom inputs
-total_living_wage_custom = (
-    housing_input + food_input + childcare_input +
-    transport_input + health_input + other_input +
-    civic_input + internet_input + taxes_input
-)
-
-
-# ---------- Data Loaders ----------
-@st.cache_data
-def load_housing_gdf():
-    gdf = gpd.read_file("fort_worth_grid_pieces_bedrooms.geojson")
-    gdf = gdf.to_crs(4326)
-    return gdf
-
-@st.cache_data
-def get_city_boundary():
-    city_gdf = gpd.read_file("fort_worth_city_boundary.geojson")  
-    city_gdf = city_gdf.to_crs(4326)
-    return city_gdf
-
-gdf = load_housing_gdf()
-city_gdf = get_city_boundary()
-gdf = gdf[gdf[bedroom_col] > 0].copy()
-
-# ---------- Living Wage Data ----------
-
-percentile = 0.40  # fixed 40th percentile (can be changed or made dynamic)
-
-breakdown_df = living_wage_breakdown(q=percentile)
-breakdown_df.columns = [col.strip().lower().replace('#', '').strip() for col in breakdown_df.columns]
-filtered = breakdown_df.loc[[family_type]] if family_type in breakdown_df.index else None
-
-if filtered is not None and not filtered.empty:
-    housing_cost_pct = filtered["housing"].values[0]
-    total_living_wage_pct = filtered["total"].values[0]
-else:
-    housing_cost_pct = housing_input  # fallback
-    total_living_wage_pct = total_living_wage_custom
-    st.warning("No matching data found for this family type in dataset, using custom inputs.")
-
-# ---------- Color Coding ----------
-
-def to_color(rent):
-    if rent <= housing_input:
-        return [0, 185, 0, 120]  # Green if rent <= custom housing budget
+import warmup
+from colors import affordability_expression
+from loaders import DEFAULT_BUDGET, MAP_ZOOM, city_boundary, grid_layers, joint_for
+from places import DEFAULT_PLACE, PLACES, available_places, ensure_built
+from profiling import RerunProfiler, profiling_requested
+from stages import StageGraph
+from tiles import TILESETS, ensure_tileset, serve, tile_url, tiles_requested
+from wage_cache import cached_breakdown, cached_table
+from zonal import tract_summary
+
+st.set_page_config(page_title="Living Wage Explorer", layout="wide")
+
+# opt-in stage timings (LW_PROFILE=1 or ?profile=1); a no-op otherwise
+prof = RerunProfiler(enabled=profiling_requested(st.query_params))
+# the script body runs in try/finally so reruns cut short by a widget
+# change, st.stop() or st.rerun() still finish the profiler
+try:
+    # opt-in vector tile map (LW_TILES=1 or ?tiles=1): geometry comes from the
+    # local tile endpoint and cells are colored in the browser
+    use_tiles = tiles_requested(st.query_params)
+    # background warm-up, shared by the server process (started here unless
+    # the server was launched through warmup.py)
+    warm = warmup.start()
+
+    # ---------- Sidebar Inputs ----------
+    st.sidebar.header("User Inputs")
+
+    place_slugs = available_places()
+    place_slug = st.sidebar.selectbox(
+        "City", place_slugs, index=place_slugs.index(DEFAULT_PLACE),
+        format_func=lambda slug: PLACES[slug].name)
+    try:
+        with st.spinner(f"Preparing {PLACES[place_slug].name} data…"):
+            place = ensure_built(PLACES[place_slug])    # built on first request
+    except (OSError, ValueError) as err:
+        st.error(f"{PLACES[place_slug].name} data could not be built: {err}")
+        st.stop()
+
+    st.title(f"🏠 {place.name} Living Wage Housing Affordability Explorer")
+    warm.warm_place(place)     # no-op once the place is scheduled
+
+    family_type_options = [
+        "1 Adult", "1 Adult 1 Child", "1 Adult 2 Children", "1 Adult 3 Children",
+        "2 Adults (1 Working)", "2 Adults (1 Working) 1 Child", "2 Adults (1 Working) 2 Children", "2 Adults (1 Working) 3 Children",
+        "2 Adults (2 Working)", "2 Adults (2 Working) 1 Child", "2 Adults (2 Working) 2 Children", "2 Adults (2 Working) 3 Children"
+    ]
+    family_type = st.sidebar.selectbox("Select your family type", family_type_options)
+    bedroom_options = {
+        "All Units": "median_rent_all",
+        "Studio (0 BR)": "median_rent_0br",
+        "1 Bedroom": "median_rent_1br",
+        "2 Bedrooms": "median_rent_2br",
+        "3 Bedrooms": "median_rent_3br",
+        "4+ Bedrooms": "median_rent_4br"
+    }
+    bedroom_label = st.sidebar.selectbox("Number of Bedrooms", list(bedroom_options.keys()))
+    bedroom_col = bedroom_options[bedroom_label]
+    color_options = {
+        "Within Budget (Green/Red)": "binary",
+        "Rent-to-Budget Gradient": "gradient",
+    }
+    color_label = st.sidebar.selectbox("Map Coloring", list(color_options.keys()))
+    color_mode = color_options[color_label]
+
+
+    st.sidebar.markdown("###  Monthly Cost Inputs")
+
+    housing_input = st.sidebar.number_input("Housing ($/mo)", min_value=500, max_value=5000, value=DEFAULT_BUDGET)
+    food_input = st.sidebar.number_input("Food ($/mo)", min_value=100, max_value=2000, value=350)
+    childcare_input = st.sidebar.number_input("Child Care ($/mo)", min_value=0, max_value=3000, value=800)
+    transport_input = st.sidebar.number_input("Transportation ($/mo)", min_value=50, max_value=1500, value=400)
+    health_input = st.sidebar.number_input("Health Care ($/mo)", min_value=50, max_value=1500, value=160)
+    other_input = st.sidebar.number_input("Other Necessities ($/mo)", min_value=50, max_value=1500, value=300)
+    civic_input = st.sidebar.number_input("Civic Engagement ($/mo)", min_value=0, max_value=1000, value=170)
+    internet_input = st.sidebar.number_input("Internet ($/mo)", min_value=0, max_value=500, value=90)
+    taxes_input = st.sidebar.number_input("Taxes ($/mo)", min_value=0, max_value=3000, value=500)
+
+    percentile = st.sidebar.slider(
+        "Select Living Wage Percentile (Reference Table)", 
+        min_value=0.1, max_value=0.9, value=0.40, step=0.01, format="%.2f"
+    )
+    model_options = {
+        "Same Percentile in Every Category": "category",
+        "Joint Simulation (Correlated Costs)": "joint",
+    }
+    model_label = st.sidebar.selectbox("Percentile Model (Reference Table)", list(model_options.keys()))
+    cost_model = model_options[model_label]
+
+    costs = {
+        "housing": housing_input,
+        "transport": transport_input,
+        "food": food_input,
+        "health": health_input,
+        "civic": civic_input,
+        "other": other_input,
+        "childcare": childcare_input,
+        "internet": internet_input,
+        "tax": taxes_input,
+    }
+
+
+    # ---------- Data Loaders ----------
+    # Grid layers, boundary payloads and joint models come from loaders.py:
+    # the process-wide, memory-bounded shared cache, filled in the background
+    # by warmup.py and shared by every session.  Until this place's map data
+    # is warm, the map and tract table show a placeholder instead of blocking.
+    map_keys = [("grid_layers", place.slug), ("city_boundary", place.slug),
+                *[("tiles", place.slug, name) for name in TILESETS if use_tiles]]
+    map_ready = warm.ready_for(*map_keys)
+
+    @st.cache_resource
+    def start_tile_server():
+        # one local tile endpoint per process; builds the MBTiles on first start
+        try:
+            return serve()
+        except OSError:     # port taken, e.g. another app process serving the same cache
+            return None
+
+    BREAKDOWN_PERCENTILE = 0.40  # fixed 40th percentile (can be changed or made dynamic)
+
+
+    # ---------- Stage Graph ----------
+    # Each stage names the inputs / stages it reads; a rerun only recomputes
+    # stages downstream of a changed widget (e.g. the food input touches
+    # just the custom breakdown), the rest come from the session's last run.
+    graph = StageGraph()
+
+    @graph.stage("place", "bedroom_col", "map_ready")
+    def cells(place, bedroom_col, map_ready):
+        # only cells with a rent for this bedroom type
+        return grid_layers(place).frame(bedroom_col) if map_ready else None
+
+    @graph.stage("place", "bedroom_col", "map_ready")
+    def map_center(place, bedroom_col, map_ready):
+        return grid_layers(place).center(bedroom_col) if map_ready else None
+
+    # the 81 slider tables are warmed in the background; a miss computes one
+    @graph.stage("place", "family_type")
+    def reference_breakdown(place, family_type):
+        breakdown_df = cached_breakdown(BREAKDOWN_PERCENTILE, place)
+        breakdown_df.columns = [col.strip().lower().replace('#', '').strip() for col in breakdown_df.columns]
+        return breakdown_df.loc[[family_type]] if family_type in breakdown_df.index else None
+
+    def tile_layers(place, bedroom_col, housing_input, color_mode):
+        import pydeck as pdk
+
+        start_tile_server()
+        for tileset in TILESETS:
+            ensure_tileset(tileset, place)
+        # every rent column travels in the grid tiles; only this expression
+        # changes with the budget / bedroom type
+        grid_layer = pdk.Layer(
+            "MVTLayer",
+            data=tile_url("grid", place),
+            binary=False,
+            get_fill_color=affordability_expression(
+                f"properties.{bedroom_col}", housing_input, mode=color_mode),
+            update_triggers={"getFillColor": [bedroom_col, housing_input, color_mode]},
+            pickable=True,
+            auto_highlight=True,
+            stroked=True,
+            get_line_color=[60, 60, 60, 90],
+            line_width_min_pixels=1,
+        )
+        tract_outline_layer = pdk.Layer(
+            "MVTLayer",
+            data=tile_url("tracts", place),
+            filled=False,
+            stroked=True,
+            get_line_color=[60, 60, 60, 160],
+            line_width_min_pixels=1,
+        )
+        city_boundary_layer = pdk.Layer(
+            "MVTLayer",
+            data=tile_url("boundary", place),
+            get_fill_color=[0, 0, 0, 30],
+            stroked=True,
+            get_line_color=[0, 0, 0, 255],
+            line_width_min_pixels=2,
+        )
+        return [grid_layer, tract_outline_layer, city_boundary_layer]
+
+    @graph.stage("place", "cells", "map_center", "bedroom_label", "bedroom_col",
+                 "housing_input", "color_mode", "use_tiles")
+    def deck(place, cells, map_center, bedroom_label, bedroom_col,
+             housing_input, color_mode, use_tiles):
+        if map_center is None:              # still warming up
+            return None
+        import pydeck as pdk   # only needed once there is a map to draw
+
+        tooltip = {
+            "html": f"<b>{bedroom_label} Rent: ${{{bedroom_col}}}</b>",
+            "style": {"color": "white"}
+        }
+        grid_lon, grid_lat = map_center
+        initial_view = pdk.ViewState(
+            longitude=grid_lon,
+            latitude=grid_lat,
+            zoom=MAP_ZOOM,
+            pitch=0,
+        )
+        if use_tiles:
+            return pdk.Deck(
+                layers=tile_layers(place, bedroom_col, housing_input, color_mode),
+                initial_view_state=initial_view,
+                tooltip=tooltip,
+                map_style="mapbox://styles/mapbox/light-v9"
+            )
+
+        # one row per polygon part; LineLayer gets each ring (exterior or hole)
+        city_gdf_flat, city_lines_df = city_boundary(place)
+
+        # Green if rent <= custom housing budget, red otherwise (or a
+        # gradient): colored in the browser from the rent column, like the
+        # tiles, so no per-cell color rows are built or serialized
+        tract_layer = pdk.Layer(
+            "PolygonLayer",
+            data=cells,
+            get_polygon="coordinates",
+            get_fill_color=affordability_expression(bedroom_col, housing_input, mode=color_mode),
+            update_triggers={"getFillColor": [bedroom_col, housing_input, color_mode]},
+            pickable=True,
+            auto_highlight=True,
+            stroked=True,
+            get_line_color=[60, 60, 60, 90],
+            line_width_min_pixels=1,
+        )
+
+        city_boundary_layer = pdk.Layer(
+            "PolygonLayer",
+            data=city_gdf_flat,
+            get_polygon="coordinates",
+            get_fill_color=[0, 0, 0, 30],
+            stroked=True,
+            get_line_color=[0, 0, 0, 200],
+            line_width_min_pixels=1,
+        )
+
+        city_outline_layer = pdk.Layer(
+            "LineLayer",
+            data=city_lines_df,
+            get_path="path",
+            get_color=[0, 0, 0, 255],
+            get_width=6,
+        )
+
+        map_deck = pdk.Deck(
+            layers=[tract_layer, city_boundary_layer, city_outline_layer],
+            initial_view_state=initial_view,
+            tooltip=tooltip,
+            map_style="mapbox://styles/mapbox/light-v9"
+        )
+        # the deck is reused until an upstream input changes: serialize it once
+        map_deck.to_json = functools.cache(map_deck.to_json)
+        return map_deck
+
+    # same budget as the map colors; also cached per (bedroom column, budget)
+    @graph.stage("place", "bedroom_col", "housing_input", "map_ready")
+    def tract_table(place, bedroom_col, housing_input, map_ready):
+        if not map_ready:
+            return None
+        return tract_summary(bedroom_col, float(housing_input), place).sort_values(
+            "affordable_share", ascending=False)
+
+    @graph.stage("costs", "family_type")
+    def custom_breakdown(costs, family_type):
+        return pd.DataFrame([{**costs, "total": sum(costs.values())}], index=[family_type])
+
+    @graph.stage("place", "percentile", "family_type", "cost_model")
+    def reference_table(place, percentile, family_type, cost_model):
+        # percentile of each category vs percentile of the simulated household total
+        ref_table = (joint_for(place).table(percentile) if cost_model == "joint"
+                     else cached_table(percentile, place))
+        return ref_table.loc[[family_type]] if family_type in ref_table.index else None
+
+    results = graph.run(
+        st.session_state.setdefault("stage_graph", {}),
+        {
+            "place": place,
+            "family_type": family_type,
+            "bedroom_col": bedroom_col,
+            "bedroom_label": bedroom_label,
+            "color_mode": color_mode,
+            "use_tiles": use_tiles,
+            "map_ready": map_ready,
+            "housing_input": housing_input,
+            "costs": costs,
+            "percentile": percentile,
+            "cost_model": cost_model,
+        },
+        profiler=prof,
+    )
+
+    filtered = results["reference_breakdown"]
+    total_living_wage_custom = results["custom_breakdown"]["total"].iloc[0]
+    if filtered is None or filtered.empty:
+        st.warning("No matching data found for this family type in dataset, using custom inputs.")
+
+    # ---------- MAP ----------
+
+    st.subheader(f"🗺️ All Grid Cells in {place.name} ({bedroom_label})\nGreen = Below Budget, Red = Above Budget")
+
+    # ---------- Warm-up progress ----------
+    # while this place's map data is warming, poll and rerun the page once
+    # it is ready; afterwards the fragment stops polling
+    @st.fragment(run_every=None if map_ready else warmup.POLL_SECONDS)
+    def warmup_progress():
+        status = warm.status()
+        if not map_ready and warm.ready_for(*map_keys):
+            st.rerun()
+        if status["done"] < status["total"]:
+            st.progress(status["done"] / status["total"],
+                        text=f"Warming up caches: {status['done']}/{status['total']} ready")
+
+    warmup_progress()
+
+    map_col, zone_col = st.columns([3, 2])
+    with prof.stage("render map"):
+        if results["deck"] is None:
+            map_col.info(f"Preparing the {place.name} map…")
+        else:
+            map_col.pydeck_chart(results["deck"])
+
+    # ---------- Per-tract summary (next to the map) ----------
+    zone_col.markdown(f"#### Affordability by Census Tract (${housing_input:,}/mo)")
+    if results["tract_table"] is None:
+        zone_col.info("Preparing the tract summary…")
     else:
-        return [212, 0, 0, 120]  # Red otherwise
+        zone_col.dataframe(
+            results["tract_table"],
+            column_config={
+                "cells": "Cells",
+                "cells_with_rent": "With Rent",
+                "affordable_cells": "Affordable",
+                "affordable_share": st.column_config.ProgressColumn(
+                    "Share Affordable", format="percent", min_value=0.0, max_value=1.0),
+                "rent_gap_p25": st.column_config.NumberColumn("Gap P25", format="$%.0f"),
+                "rent_gap_p50": st.column_config.NumberColumn("Gap P50", format="$%.0f"),
+                "rent_gap_p75": st.column_config.NumberColumn("Gap P75", format="$%.0f"),
+            },
+            height=480,
+        )
+
+    # ---------- Color legend ----------
+    st.markdown(
+        """
+        <div style="display: flex; align-items: center;">
+            <div style="background: linear-gradient(to right, #00b900, #d40000); width: 160px; height: 18px; margin-right: 10px;"></div>
+            <div>Affordable (Green) &larr; &rarr; Not Affordable (Red)</div>
+        </div>
+        """, unsafe_allow_html=True
+    )
+
+    # ---------- Display Selected Info ----------
+
+    st.markdown(f"### 👨‍👩‍👧 Selected Family Type: `{family_type}`")
+    st.success(f"**Custom Required Living Wage:** **${total_living_wage_custom:,.0f}/month**")
+
+
+    # ---------- User-Driven Cost Inputs & Data Table ----------
+
+    st.markdown("#### Living Wage Breakdown (Custom Inputs)")
+    st.dataframe(results["custom_breakdown"])
+    st.markdown("#### Living Wage Breakdown (Reference Data)")
+    if filtered is not None and not filtered.empty:
+        st.dataframe(filtered)
+    else:
+        st.info("No reference data available for this family type.")
+
 
-gdf["fill_color"] = gdf[bedroom_col].apply(to_color)
+    # ---------- Show Reference Living Wage Table ----------
 
-def extract_coords(geom):
-    if geom is None:
-        return []
-    if geom.geom_type == 'Polygon':
-        return [list(geom.exterior.coords)]
-    elif geom.geom_type == 'MultiPolygon':
-        return [list(p.exterior.coords) for p in geom.geoms]
+    if results["reference_table"] is not None:
+        st.markdown(f"#### Living Wage Table (Selected Family Type)")
+        st.dataframe(results["reference_table"])
     else:
-        return []
-
-gdf["coordinates"] = gdf["geometry"].apply(extract_coords)
-gdf["lon"] = gdf.geometry.centroid.x
-gdf["lat"] = gdf.geometry.centroid.y
-
-# ---------- City Boundary for pydeck ----------
-city_gdf_flat = city_gdf.explode(index_parts=False).reset_index(drop=True)
-
-def get_polygon_coords(geom):
-    if geom.geom_type == "Polygon":
-        return [list(geom.exterior.coords)] + [list(ring.coords) for ring in geom.interiors]
-    return []
-
-city_gdf_flat["coordinates"] = city_gdf_flat.geometry.apply(get_polygon_coords)
-
-# For LineLayer: Each ring (exterior or hole) as separate path
-all_boundary_lines = []
-for geom in city_gdf_flat.geometry:
-    if geom.geom_type == "Polygon":
-        all_boundary_lines.append(list(geom.exterior.coords))
-        for ring in geom.interiors:
-            all_boundary_lines.append(list(ring.coords))
-city_lines_df = pd.DataFrame({"path": all_boundary_lines})
-
-# ---------- MAP ----------
-
-st.subheader(f"🗺️ All Grid Cells in Fort Worth ({bedroom_label})\nGreen = Below Budget, Red = Above Budget")
-
-tooltip = {
-    "html": f"<b>{bedroom_label} Rent: ${{{bedroom_col}}}</b>",
-    "style": {"color": "white"}
-}
-
-tract_layer = pdk.Layer(
-    "PolygonLayer",
-    data=gdf,
-    get_polygon="coordinates",
-    get_fill_color="fill_color",
-    pickable=True,
-    auto_highlight=True,
-    stroked=True,
-    get_line_color=[60, 60, 60, 90],
-    line_width_min_pixels=1,
-)
-
-city_boundary_layer = pdk.Layer(
-    "PolygonLayer",
-    data=city_gdf_flat,
-    get_polygon="coordinates",
-    get_fill_color=[0, 0, 0, 30],
-    stroked=True,
-    get_line_color=[0, 0, 0, 200],
-    line_width_min_pixels=1,
-)
-
-city_outline_layer = pdk.Layer(
-    "LineLayer",
-    data=city_lines_df,
-    get_path="path",
-    get_color=[0, 0, 0, 255],
-    get_width=6,
-)
-
-initial_view = pdk.ViewState(
-    longitude=gdf["lon"].mean(),
-    latitude=gdf["lat"].mean(),
-    zoom=10,
-    pitch=0,
-)
-
-st.pydeck_chart(
-    pdk.Deck(
-        layers=[tract_layer, city_boundary_layer, city_outline_layer],
-        initial_view_state=initial_view,
-        tooltip=tooltip,
-        map_style="mapbox://styles/mapbox/light-v9"
+        st.info("No reference data available for this family type in the table.")
+    # ---------- Footer ----------
+    st.markdown(
+        f"""
+        <div class="footer">
+            Made in FwLab<br>
+            Data: <a href="{place.census_url}" target="_blank">Census Data</a>
+        </div>
+        """,
+        unsafe_allow_html=True
     )
-)
-
-# ---------- Color legend ----------
-st.markdown(
-    """
-    <div style="display: flex; align-items: center;">
-        <div style="background: linear-gradient(to right, #00b900, #d40000); width: 160px; height: 18px; margin-right: 10px;"></div>
-        <div>Affordable (Green) &larr; &rarr; Not Affordable (Red)</div>
-    </div>
-    """, unsafe_allow_html=True
-)
-
-# ---------- Display Selected Info ----------
-
-st.markdown(f"### 👨‍👩‍👧 Selected Family Type: `{family_type}`")
-st.success(f"**Custom Required Living Wage:** **${total_living_wage_custom:,.0f}/month**")
-
-
-# ---------- User-Driven Cost Inputs & Data Table ----------
-
-custom_breakdown = pd.DataFrame([{
-    "housing": housing_input,
-    "transport": transport_input,
-    "food": food_input,
-    "health": health_input,
-    "civic": civic_input,
-    "other": other_input,
-    "childcare": childcare_input,
-    "internet": internet_input,
-    "tax": taxes_input,
-    "total": total_living_wage_custom
-}], index=[family_type])
-
-st.markdown("#### Living Wage Breakdown (Custom Inputs)")
-st.dataframe(custom_breakdown)
-st.markdown("#### Living Wage Breakdown (Reference Data)")
-if filtered is not None and not filtered.empty:
-    st.dataframe(filtered)
-else:
-    st.info("No reference data available for this family type.")
-
-
-# ---------- Show Reference Living Wage Table ----------
-
-percentile = st.sidebar.slider(
-    "Select Living Wage Percentile (Reference Table)", 
-    min_value=0.1, max_value=0.9, value=0.40, step=0.01, format="%.2f"
-)
-
-ref_table = living_wage_table(q=percentile)
-if family_type in ref_table.index:
-    st.markdown(f"#### Living Wage Table (Selected Family Type)")
-    st.dataframe(ref_table.loc[[family_type]])
-else:
-    st.info("No reference data available for this family type in the table.")
-# ---------- Footer ----------
-st.markdown(
-    """
-    <div class="footer">
-        Made in FwLab<br>
-        Data: <a href="https://data.census.gov/profile/Fort_Worth_city,_Texas?g=160XX00US4827000" target="_blank">Census Data</a>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+finally:
+    prof.finish()
@@ -0,0 +1,215 @@
+# benchmarks.py  ──────────────────────────────────────────────────────
+# Offline timing harness for the model and map-preparation hot paths.
+#
+#   python benchmarks.py                          # run, print, write JSON
+#   python benchmarks.py --save-baseline          # store as the baseline
+#   python benchmarks.py --baseline bench_baseline.json --threshold 0.25
+#   python benchmarks.py -k startup               # cold-start budget only
+#
+# Every case uses fixed seeds and synthetic data, so results only depend
+# on the code and the machine.  Exit status is 1 when any case is slower
+# than the baseline by more than the threshold, or when a startup case
+# exceeds its budget in STARTUP_BUDGETS.
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+GRID_CELLS = 2_268                    # cells in the shipped grid dataset
+GRID_SCALES = (1, 10, 100)
+FW_BOUNDS = (-97.55, 32.55, -97.03, 33.05)  # lon/lat box around Fort Worth
+DEFAULT_BASELINE = "bench_baseline.json"
+
+# seconds in a fresh interpreter — what every cold app session pays
+STARTUP_BUDGETS = {
+    "startup.import living_wage": 1.0,
+    "startup.import breakdown": 1.0,
+    "startup.app modules": 1.2,
+    "startup.app first data load": 1.5,
+}
+_STARTUP_CODE = {
+    "startup.import living_wage": "import living_wage",
+    "startup.import breakdown": "import breakdown",
+    "startup.app modules": "import colors, datasets, geometry, loaders, places, profiling, shared_cache, stages, tiles, wage_cache, warmup, zonal",
+    "startup.app first data load": (
+        "from datasets import bedroom_layers; from wage_cache import cached_breakdown; "
+        "from zonal import tract_summary; bedroom_layers('grid', zoom=10); "
+        "cached_breakdown(0.4); tract_summary('median_rent_all', 1450.0)"),
+}
+
+
+# ── synthetic inputs ─────────────────────────────────────────────────
+def synthetic_grid(n_cells: int, seed: int = 0):
+    """`n_cells` square cells tiling FW_BOUNDS, with ACS-like rents."""
+    import shapely
+
+    rng = np.random.default_rng(seed)
+    side = int(np.ceil(np.sqrt(n_cells)))
+    x0, y0, x1, y1 = FW_BOUNDS
+    dx, dy = (x1 - x0) / side, (y1 - y0) / side
+    i, j = np.divmod(np.arange(n_cells), side)
+    cells = shapely.box(x0 + j * dx, y0 + i * dy, x0 + (j + 1) * dx, y0 + (i + 1) * dy)
+    rents = rng.normal(1450, 350, n_cells).round()
+    rents[rng.random(n_cells) < 0.05] = -666666666     # Census sentinel
+    return cells, rents
+
+
+# ── cases ────────────────────────────────────────────────────────────
+def _model_cases():
+    import taxes
+    from breakdown import living_wage_breakdown
+    from living_wage import living_wage_cube, living_wage_table
+    from wage_cache import SLIDER_PERCENTILES
+
+    rng = np.random.default_rng(1)
+    nets = rng.uniform(20_000, 150_000, 100_000)
+    scalar_nets = nets[:1_000]
+
+    def scalar_gross_up():
+        for net in scalar_nets:
+            taxes.gross_from_net(net, "hoh", children=2, earners=1)
+
+    return {
+        "taxes.gross_from_net[x1000]": scalar_gross_up,
+        "taxes.gross_from_net_array[100k]":
+            lambda: taxes.gross_from_net_array(nets, "married", children=2, earners=2),
+        "living_wage.living_wage_table": lambda: living_wage_table(0.4),
+        "breakdown.living_wage_breakdown": lambda: living_wage_breakdown(0.4),
+        "living_wage.living_wage_cube[81]": lambda: living_wage_cube(SLIDER_PERCENTILES),
+    }
+
+
+def _map_cases(scales):
+    from colors import affordability_colors
+    from geometry import pack_polygons, polygon_coordinates
+
+    cases = {}
+    for scale in scales:
+        cells, rents = synthetic_grid(GRID_CELLS * scale)
+        packed = pack_polygons(cells)
+        tag = f"[{scale}x]"
+        cases.update({
+            f"geometry.pack_polygons{tag}": lambda c=cells: pack_polygons(c),
+            f"geometry.polygon_coordinates{tag}": lambda p=packed: polygon_coordinates(p),
+            f"colors.binary{tag}": lambda r=rents: affordability_colors(r, 1450),
+            f"colors.gradient{tag}":
+                lambda r=rents: affordability_colors(r, 1450, mode="gradient"),
+        })
+    return cases
+
+
+def _startup_cases():
+    """Each case runs its imports / first loads in a new interpreter."""
+    root = Path(__file__).resolve().parent
+
+    def cold(code):
+        return lambda: subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+    return {name: cold(code) for name, code in _STARTUP_CODE.items()}
+
+
+def over_budget(current: dict) -> list:
+    """Startup cases whose median exceeds STARTUP_BUDGETS."""
+    over = []
+    for name, budget in STARTUP_BUDGETS.items():
+        res = current["results"].get(name)
+        if res is not None and res["median"] > budget:
+            print(f"{name:<42} {res['median']:.3f} s > budget {budget:.3f} s")
+            over.append(name)
+    return over
+
+
+def time_case(fn, repeat: int, min_time: float = 0.2) -> dict:
+    """Best / median seconds per call over `repeat` rounds (after a warm-up)."""
+    fn()
+    t0 = time.perf_counter()
+    fn()
+    once = time.perf_counter() - t0
+    number = max(1, int(min_time / max(once, 1e-9) / repeat))
+
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return {"best": min(samples), "median": statistics.median(samples),
+            "repeat": repeat, "number": number}
+
+
+def run(pattern: str = "", repeat: int = 5, scales=GRID_SCALES) -> dict:
+    cases = {**_model_cases(), **_map_cases(scales), **_startup_cases()}
+    results = {}
+    for name, fn in cases.items():
+        if pattern in name:
+            results[name] = time_case(fn, repeat)
+            print(f"{name:<42} {results[name]['median'] * 1e3:10.3f} ms")
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Names of cases whose median is > (1 + threshold) × the baseline's."""
+    regressions = []
+    for name, res in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = res["median"] / base["median"]
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:<42} {ratio:6.2f}x baseline {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the living-wage, tax and map-preparation hot paths.")
+    parser.add_argument("-k", "--filter", default="", help="run cases containing this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-scale", type=int, default=max(GRID_SCALES),
+                        help="largest synthetic grid multiple to run")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown vs baseline (0.25 = 25 %%)")
+    args = parser.parse_args(argv)
+
+    scales = [s for s in GRID_SCALES if s <= args.max_scale]
+    current = run(args.filter, args.repeat, scales)
+    with open(args.output, "w") as fh:
+        json.dump(current, fh, indent=2)
+
+    failed = bool(over_budget(current))
+    if args.save_baseline:
+        with open(args.baseline, "w") as fh:
+            json.dump(current, fh, indent=2)
+        return int(failed)
+    try:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+    except FileNotFoundError:
+        print(f"no baseline at {args.baseline}; run with --save-baseline first")
+        return int(failed)
+    return 1 if compare(current, baseline, args.threshold) or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+# build_data.py  ──────────────────────────────────────────────────────
+# Scripted version of the notebook's data build: TIGER tracts + places
+# → grid pieces and tracts carrying ACS median rent by bedrooms.
+#
+#   python build_data.py --place "Fort Worth"                 # ACS from the API → build/
+#   python build_data.py --place Dallas --place Arlington --acs acs_2023_tx.csv
+#   python build_data.py --all-places --format parquet --out-dir parquet/
+#
+# Existing files are not overwritten without --force; in particular the
+# shipped fort_worth_*.geojson the app is keyed on stay untouched unless
+# --out-dir . --force is asked for explicitly.
+#
+# The TIGER shapefiles (tl_2023_48_tract.shp / tl_2023_48_place.shp and
+# their .shx) must sit next to the .dbf files in this folder.  All spatial
+# work is bulk STRtree queries and vectorised shapely calls — no
+# per-feature Python loops — so every Texas place builds in one pass.
+import argparse
+import json
+from pathlib import Path
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent
+TRACTS_SHP = str(DATA_DIR / "tl_2023_48_tract.shp")
+PLACES_SHP = str(DATA_DIR / "tl_2023_48_place.shp")
+GRID_SIZE = 0.01          # degrees (EPSG:4269), about 1 km
+BUILD_DIR = "build"
+
+# ACS 5-year variables → output columns (tables B25031, B25035)
+ACS_COLUMNS = {
+    "B25031_001E": "median_rent_all",
+    "B25031_002E": "median_rent_0br",
+    "B25031_003E": "median_rent_1br",
+    "B25031_004E": "median_rent_2br",
+    "B25031_005E": "median_rent_3br",
+    "B25031_006E": "median_rent_4br",
+    "B25031_007E": "median_rent_5pbr",
+    "B25035_001E": "median_year_built",
+}
+
+
+# ── inputs ───────────────────────────────────────────────────────────
+def fetch_acs(year: int = 2023, state: str = "48", api_key: str = None) -> pd.DataFrame:
+    """Every tract of `state` from the Census API, keyed by tract/county."""
+    url = (f"https://api.census.gov/data/{year}/acs/acs5"
+           f"?get={','.join(ACS_COLUMNS)}&for=tract:*&in=state:{state}")
+    if api_key:
+        url += f"&key={api_key}"
+    with urlopen(url) as resp:
+        header, *rows = json.load(resp)
+    return _tidy_acs(pd.DataFrame(rows, columns=header))
+
+
+def read_acs(path) -> pd.DataFrame:
+    """ACS table saved as CSV (raw variable codes or renamed columns)."""
+    return _tidy_acs(pd.read_csv(path, dtype={"tract": str, "county": str}))
+
+
+def _tidy_acs(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.rename(columns=ACS_COLUMNS)
+    df["tract"] = df["tract"].astype(str).str.zfill(6)
+    df["county"] = df["county"].astype(str).str.zfill(3)
+    df[list(ACS_COLUMNS.values())] = df[list(ACS_COLUMNS.values())].astype("int64")
+    return df[["tract", "county"] + list(ACS_COLUMNS.values())]
+
+
+def read_tiger(tracts_path=TRACTS_SHP, places_path=PLACES_SHP):
+    import geopandas as gpd
+
+    tracts = gpd.read_file(tracts_path, columns=["TRACTCE", "COUNTYFP", "GEOID"])
+    places = gpd.read_file(places_path, columns=["GEOID", "NAME"]).to_crs(tracts.crs)
+    return tracts, places
+
+
+# ── spatial steps ────────────────────────────────────────────────────
+def place_tract_pairs(tracts, places) -> np.ndarray:
+    """(2, k) array of (place, tract) positions whose geometries intersect."""
+    import shapely
+
+    tree = shapely.STRtree(tracts.geometry.values)
+    return tree.query(places.geometry.values, predicate="intersects")
+
+
+def tract_grid(geoms, size: float = GRID_SIZE):
+    """
+    Square cells covering each geometry's bounding box, anchored at its
+    lower-left corner (same cells as the notebook's nested np.arange loops).
+    Returns (cells, owner) with owner = position of the source geometry.
+    """
+    import shapely
+
+    minx, miny, maxx, maxy = shapely.bounds(geoms).T
+    nx = np.ceil((maxx - minx) / size).astype(np.int64)
+    ny = np.ceil((maxy - miny) / size).astype(np.int64)
+    per = nx * ny
+    owner = np.repeat(np.arange(len(per)), per)
+    k = np.arange(per.sum()) - np.repeat(np.cumsum(per) - per, per)
+    ix, iy = np.divmod(k, ny[owner])
+    x = minx[owner] + ix * size
+    y = miny[owner] + iy * size
+    return shapely.box(x, y, x + size, y + size), owner
+
+
+def build_grid(tracts, places, acs: pd.DataFrame = None,
+               size: float = GRID_SIZE, clip_to_place: bool = False):
+    """
+    Grid pieces for every place in `places`: each tract touching a place is
+    cut into `size` cells; cells touching both the tract and the place are
+    kept, clipped to the tract (and to the place with `clip_to_place`).
+    """
+    import geopandas as gpd
+    import shapely
+
+    pairs = place_tract_pairs(tracts, places)
+    tract_ids = np.unique(pairs[1])
+    tract_geoms = tracts.geometry.values[tract_ids]
+    shapely.prepare(tract_geoms)
+
+    cells, owner = tract_grid(tract_geoms, size)
+    hit = shapely.intersects(tract_geoms[owner], cells)
+    cells, owner = cells[hit], owner[hit]
+
+    # cells × places in one bulk query, then keep only the place/tract
+    # combinations found above
+    place_geoms = places.geometry.values
+    cell_idx, place_idx = shapely.STRtree(place_geoms).query(cells, predicate="intersects")
+    wanted = pairs[0] * len(tracts) + pairs[1]
+    keep = np.isin(place_idx * len(tracts) + tract_ids[owner[cell_idx]], wanted)
+    cell_idx, place_idx = cell_idx[keep], place_idx[keep]
+
+    # query results come back in cell order (= TIGER tract order, then grid
+    # order); a stable sort groups them by place without disturbing that
+    order = np.argsort(place_idx, kind="stable")
+    cell_idx, place_idx = cell_idx[order], place_idx[order]
+
+    pieces = shapely.intersection(cells[cell_idx], tract_geoms[owner[cell_idx]])
+    if clip_to_place:
+        pieces = shapely.intersection(pieces, place_geoms[place_idx])
+    nonempty = ~shapely.is_empty(pieces)
+    cell_idx, place_idx = cell_idx[nonempty], place_idx[nonempty]
+
+    src = tracts.iloc[tract_ids[owner[cell_idx]]]
+    grid = gpd.GeoDataFrame({
+        "place": places["GEOID"].to_numpy()[place_idx],
+        "tract": src["TRACTCE"].to_numpy(),
+        "county": src["COUNTYFP"].to_numpy(),
+    }, geometry=pieces[nonempty], crs=tracts.crs)
+    return _join_acs(grid, acs)
+
+
+def build_tracts(tracts, places, acs: pd.DataFrame = None):
+    """Tracts touching each place with their ACS rents and centroid lat/lon."""
+    import geopandas as gpd
+
+    place_idx, tract_idx = place_tract_pairs(tracts, places)
+    src = tracts.iloc[tract_idx]
+    out = gpd.GeoDataFrame({
+        "place": places["GEOID"].to_numpy()[place_idx],
+        "tract": src["TRACTCE"].to_numpy(),
+        "county": src["COUNTYFP"].to_numpy(),
+    }, geometry=src.geometry.values, crs=tracts.crs)
+    centroids = out.geometry.centroid
+    out["lat"], out["lon"] = centroids.y, centroids.x
+    return _join_acs(out, acs)
+
+
+def _join_acs(gdf, acs):
+    if acs is None:
+        return gdf
+    merged = gdf.merge(acs, on=["tract", "county"], how="left")
+    return merged[[c for c in merged.columns if c != "geometry"] + ["geometry"]]
+
+
+# ── CLI ──────────────────────────────────────────────────────────────
+def place_slug(name: str) -> str:
+    return name.strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def write_outputs(grid, tract_rent, places, out_dir: Path, fmt: str = "geojson",
+                  force: bool = False) -> list:
+    """
+    One grid file and one tract file per place, named like the shipped
+    data.  Raises FileExistsError before writing anything if one of them
+    exists, unless `force`.
+    """
+    names = dict(zip(places["GEOID"], places["NAME"]))
+    suffix = "parquet" if fmt == "parquet" else "geojson"
+    outputs = [(geoid, gdf, out_dir / f"{place_slug(name)}_{stem}.{suffix}")
+               for geoid, name in names.items()
+               for gdf, stem in ((grid, "grid_pieces_bedrooms"),
+                                 (tract_rent, "tracts_with_bedroom_rent"))]
+    existing = [str(path) for _, _, path in outputs if path.exists()]
+    if existing and not force:
+        raise FileExistsError(f"would overwrite {', '.join(existing)} (use --force)")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for geoid, gdf, path in outputs:
+        part = gdf[gdf["place"] == geoid].drop(columns="place")
+        if fmt == "parquet":
+            part.to_parquet(path, index=False)
+        else:
+            part.to_file(path, driver="GeoJSON")
+        written.append(path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rebuild grid/tract rent datasets from TIGER tracts and places.")
+    parser.add_argument("--place", action="append", default=[],
+                        help="place NAME as in the TIGER file (repeatable)")
+    parser.add_argument("--all-places", action="store_true")
+    parser.add_argument("--acs", help="ACS CSV instead of calling the Census API")
+    parser.add_argument("--year", type=int, default=2023)
+    parser.add_argument("--api-key")
+    parser.add_argument("--grid-size", type=float, default=GRID_SIZE)
+    parser.add_argument("--clip-to-place", action="store_true")
+    parser.add_argument("--format", choices=("geojson", "parquet"), default="geojson")
+    parser.add_argument("--out-dir", default=BUILD_DIR)
+    parser.add_argument("--force", action="store_true",
+                        help="overwrite existing output files")
+    args = parser.parse_args(argv)
+
+    tracts, places = read_tiger()
+    if not args.all_places:
+        places = places[places["NAME"].isin(args.place or ["Fort Worth"])]
+    acs = read_acs(args.acs) if args.acs else fetch_acs(args.year, api_key=args.api_key)
+
+    grid = build_grid(tracts, places, acs, args.grid_size, args.clip_to_place)
+    tract_rent = build_tracts(tracts, places, acs)
+    try:
+        written = write_outputs(grid, tract_rent, places, Path(args.out_dir), args.format,
+                                force=args.force)
+    except FileExistsError as err:
+        parser.error(str(err))
+    for path in written:
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
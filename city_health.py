@@ -1,33 +1,48 @@
-from random import choices
+from functools import lru_cache
+import numpy as np
 from family_dataclass import Family
 
-def city_health_monthly(fam: Family) -> float:
-    """
-    Return *monthly* total healthcare cost = premium + out-of-pocket
-    using the same rules you coded last year.
-    """
-    # --- out-of-pocket ----------------------------------------------
+# monthly employee premium by coverage tier
+PLANS = {
+    "ee": 51.11,
+    "ee+sp": 252.89,
+    "ee+ch": 188.68,
+    "family": 353.78,
+}
+
+def out_of_pocket_monthly(fam: Family) -> float:
     adult_oop  = 33.33 + 11.67 + 66.33    # = 111.33
     child_oop  = adult_oop * 0.8
-    oop = (adult_oop * fam.total_adults + child_oop * fam.children)
-
-    # --- premium ----------------------------------------------------
-    plans = {
-        "ee": 51.11,
-        "ee+sp": 252.89,
-        "ee+ch": 188.68,
-        "family": 353.78,
-    }
+    return adult_oop * fam.total_adults + child_oop * fam.children
 
+def premium_options(fam: Family):
+    """(premiums, weights) of the coverage tiers this household may pick."""
     if fam.total_adults == 1:
-        premium = plans["ee"] if fam.children == 0 else plans["ee+ch"]
-    else:  # two adults
-        if fam.children == 0:
-            premium = choices([plans["ee+sp"], plans["ee"]],
-                              weights=[0.5, 0.5])[0]
-        else:
-            premium = choices(
-                [plans["family"], plans["ee"], plans["ee+sp"], plans["ee+ch"]],
-                weights=[0.25, 0.25, 0.25, 0.25])[0]
+        return [PLANS["ee"] if fam.children == 0 else PLANS["ee+ch"]], [1.0]
+    if fam.children == 0:   # two adults
+        return [PLANS["ee+sp"], PLANS["ee"]], [0.5, 0.5]
+    return ([PLANS["family"], PLANS["ee"], PLANS["ee+sp"], PLANS["ee+ch"]],
+            [0.25, 0.25, 0.25, 0.25])
 
-    return premium + oop
+@lru_cache(maxsize=None)
+def city_health_monthly(fam: Family) -> float:
+    """
+    Return *monthly* total healthcare cost = expected premium + out-of-pocket
+    using the same rules you coded last year.  Deterministic, so it is
+    computed once per Family.
+    """
+    premiums, weights = premium_options(fam)
+    premium = float(np.dot(premiums, weights))
+    return premium + out_of_pocket_monthly(fam)
+
+@lru_cache(maxsize=64)
+def city_health_draws(fam: Family, n: int = 10_000, seed: int = 42) -> np.ndarray:
+    """
+    Seeded Monte Carlo version: `n` monthly health costs with the premium
+    tier drawn per household.  Returned array is read-only (it is cached).
+    """
+    premiums, weights = premium_options(fam)
+    rng = np.random.default_rng(seed)
+    draws = rng.choice(premiums, size=n, p=weights) + out_of_pocket_monthly(fam)
+    draws.flags.writeable = False
+    return draws
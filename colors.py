@@ -0,0 +1,63 @@
+# colors.py  ──────────────────────────────────────────────────────────
+# Rent → RGBA fill colors for the map, one NumPy pass per layer.
+import numpy as np
+
+AFFORDABLE   = np.array([0, 185, 0])     # green, same as the legend
+UNAFFORDABLE = np.array([212, 0, 0])     # red
+ALPHA = 120
+
+COLOR_MODES = ("binary", "gradient")
+
+
+def affordability_colors(rent,
+                         budget: float,
+                         mode: str = "binary",
+                         alpha: int = ALPHA,
+                         ratio_range=(0.75, 1.25)) -> np.ndarray:
+    """
+    (n, 4) contiguous uint8 RGBA array for an array of rents.
+
+    binary    green when rent <= budget, red otherwise
+    gradient  green → red along rent / budget, clipped to `ratio_range`
+    """
+    rent = np.asarray(rent, dtype=float)
+    rgba = np.empty((rent.size, 4), dtype=np.uint8)
+
+    if mode == "binary":
+        rgba[:, :3] = np.where((rent <= budget)[:, None], AFFORDABLE, UNAFFORDABLE)
+    elif mode == "gradient":
+        lo, hi = ratio_range
+        t = np.clip((rent / budget - lo) / (hi - lo), 0.0, 1.0)[:, None]
+        rgba[:, :3] = np.rint(AFFORDABLE + t * (UNAFFORDABLE - AFFORDABLE))
+    else:
+        raise ValueError(f"unknown color mode {mode!r}; expected one of {COLOR_MODES}")
+
+    rgba[:, 3] = alpha
+    return rgba
+
+
+def affordability_expression(field: str,
+                             budget: float,
+                             mode: str = "binary",
+                             alpha: int = ALPHA,
+                             ratio_range=(0.75, 1.25)) -> str:
+    """
+    The affordability_colors rule as a deck.gl accessor expression over
+    `field` (e.g. "properties.median_rent_1br"), evaluated in the browser
+    for vector tiles.  Features without a positive value are transparent.
+    """
+    def rgba(rgb):
+        return "[" + ", ".join(str(int(c)) for c in rgb) + f", {alpha}]"
+
+    if mode == "binary":
+        color = f"({field} <= {budget:g} ? {rgba(AFFORDABLE)} : {rgba(UNAFFORDABLE)})"
+    elif mode == "gradient":
+        lo, hi = ratio_range
+        ratio = f"{field} / {budget:g}"
+        t = f"({ratio} <= {lo:g} ? 0 : {ratio} >= {hi:g} ? 1 : ({ratio} - {lo:g}) / {hi - lo:g})"
+        channels = [str(a) if a == b else f"{a} + {t} * ({b - a})"
+                    for a, b in zip(AFFORDABLE, UNAFFORDABLE)]
+        color = "[" + ", ".join(channels) + f", {alpha}]"
+    else:
+        raise ValueError(f"unknown color mode {mode!r}; expected one of {COLOR_MODES}")
+    return f"{field} > 0 ? {color} : [0, 0, 0, 0]"
@@ -0,0 +1,131 @@
+# cube.py  ────────────────────────────────────────────────────────────
+# Headless precompute of the whole affordability cube:
+# (family type, bedroom column, percentile, grid cell) → rent gap and
+# affordable flag, against the family's housing budget from the
+# living-wage breakdown.
+#
+#   python cube.py                       # all 81 slider percentiles → cube/
+#   python cube.py --q 0.3 --q 0.4 --workers 4 --out-dir cube_small
+#
+# One process-pool task per bedroom column; each writes its own Parquet
+# part under <out-dir>/bedroom=<column>/, so the result is one
+# hive-partitioned dataset.  Cells without an estimate are left out.
+# The cube is written to a temp directory that replaces <out-dir> as a
+# whole, so a rebuild never leaves partitions of an older model behind.
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from datasets import DATASETS, RENT_COLUMNS, read_dataset
+from geometry import dataset_version
+from living_wage import CATEGORIES, FAMILY_LABELS, MODEL_VERSION, cost_cube
+from wage_cache import SLIDER_PERCENTILES
+
+CUBE_DIR = "cube"
+BEDROOM_COLUMNS = RENT_COLUMNS[:6]    # the options of the app's bedroom selector
+
+
+def housing_budgets(qs) -> np.ndarray:
+    """(percentile × family) monthly housing budget, as in the breakdown."""
+    return cost_cube(qs)[..., CATEGORIES.index("housing")].round(0)
+
+
+def _write_slab(task) -> str:
+    """Worker: all percentiles × families for one bedroom column."""
+    column, rents, out_dir, qs, budgets = task
+    cells = np.flatnonzero(rents > 0).astype(np.int32)
+    rent = rents[cells].astype(np.float32)
+
+    n_q, n_f, n_c = len(qs), len(FAMILY_LABELS), len(cells)
+    gap = rent[None, None, :] - budgets[:, :, None].astype(np.float32)   # (P, F, N)
+
+    slab = pd.DataFrame({
+        "family": pd.Categorical.from_codes(
+            np.repeat(np.tile(np.arange(n_f, dtype=np.int8), n_q), n_c), FAMILY_LABELS),
+        "percentile": np.repeat(np.asarray(qs, dtype=np.float32), n_f * n_c),
+        "cell": np.tile(cells, n_q * n_f),
+        "rent_gap": gap.ravel(),
+        "affordable": gap.ravel() <= 0,
+    })
+    part = Path(out_dir) / f"bedroom={column}"
+    part.mkdir(parents=True, exist_ok=True)
+    path = part / "part-0.parquet"
+    slab.to_parquet(path, index=False)
+    return str(path)
+
+
+def build_cube(out_dir=CUBE_DIR, qs=SLIDER_PERCENTILES,
+               columns=BEDROOM_COLUMNS, workers: int = None) -> list:
+    """
+    Compute and write the cube, replacing any earlier cube in `out_dir`;
+    returns the part files written.
+    """
+    out = Path(out_dir)
+    if out.exists() and any(out.iterdir()) and not (out / "_meta.json").exists():
+        raise FileExistsError(f"{out} is not empty and holds no cube; refusing to replace it")
+    qs = np.round(np.asarray(qs, dtype=float), 2)
+    budgets = housing_budgets(qs)
+    grid = read_dataset("grid")
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=out.parent, prefix=f".{out.name}."))
+    try:
+        tasks = [(col, grid[col].to_numpy(), str(tmp), qs, budgets) for col in columns]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_write_slab, tasks))
+
+        meta = {"model_version": MODEL_VERSION,
+                "grid_version": dataset_version(DATASETS["grid"][0]),
+                "percentiles": qs.tolist(),
+                "bedroom_columns": list(columns)}
+        (tmp / "_meta.json").write_text(json.dumps(meta, indent=2))
+
+        # swap the complete cube in; the old one is removed only afterwards
+        old = None
+        if out.exists():
+            old = out.with_name(f".{out.name}.old-{os.getpid()}")
+            os.replace(out, old)
+        tmp.chmod(0o755)
+        os.replace(tmp, out)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return [str(out / Path(part).relative_to(tmp)) for part in parts]
+
+
+def read_cube(out_dir=CUBE_DIR, family: str = None,
+              bedroom_col: str = None, q: float = None) -> pd.DataFrame:
+    """Slice of the cube, reading only the matching partition / row groups."""
+    filters = []
+    if family is not None:
+        filters.append(("family", "==", family))
+    if bedroom_col is not None:
+        filters.append(("bedroom", "==", bedroom_col))
+    if q is not None:
+        filters.append(("percentile", "==", np.float32(round(q, 2))))
+    return pd.read_parquet(out_dir, filters=filters or None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Precompute affordability for every family × bedroom × percentile × cell.")
+    parser.add_argument("--q", type=float, action="append",
+                        help="percentile (repeatable; default: all slider positions)")
+    parser.add_argument("--workers", type=int, help="process pool size")
+    parser.add_argument("--out-dir", default=CUBE_DIR)
+    args = parser.parse_args(argv)
+
+    for path in build_cube(args.out_dir, args.q or SLIDER_PERCENTILES, workers=args.workers):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
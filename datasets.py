@@ -0,0 +1,185 @@
+# datasets.py  ────────────────────────────────────────────────────────
+# Columnar copies of the GeoJSON datasets.  Each one is reprojected to
+# EPSG:4326 and pruned to the columns the apps read, then written as
+# GeoParquet next to the other build artifacts.  Loaders prefer the
+# Parquet copy and fall back to the original GeoJSON.  Simplified
+# copies can be written per map zoom (see geometry.ZOOM_TOLERANCES).
+# Every loader takes an optional `place` (places.Place) whose files stand
+# in for the Fort Worth sources below.
+#
+#   python datasets.py            # convert every dataset, full detail
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from geometry import (ARTIFACT_DIR, CITY_BOUNDARY_GEOJSON, DATA_DIR, GRID_GEOJSON,
+                      TRACTS_GEOJSON, dataset_version, load_artifact,
+                      lod_geometries, polygon_coordinates, temp_sibling,
+                      tolerance_for_zoom)
+
+RENT_COLUMNS = ["median_rent_all", "median_rent_0br", "median_rent_1br",
+                "median_rent_2br", "median_rent_3br", "median_rent_4br",
+                "median_rent_5pbr"]
+
+
+def bedroom_column(bedrooms: int) -> str:
+    """Rent column for a bedroom count (5 or more share the 5+ column)."""
+    return "median_rent_5pbr" if bedrooms >= 5 else f"median_rent_{int(bedrooms)}br"
+
+# name → (source GeoJSON, columns to keep besides geometry; None = all)
+DATASETS = {
+    "grid":          (GRID_GEOJSON, ["tract", "county"] + RENT_COLUMNS),
+    "tracts":        (TRACTS_GEOJSON,
+                      ["tract", "county", "monthly_rent", "median_bedrooms",
+                       "lat", "lon"]),
+    "tracts_rent":   (str(DATA_DIR / "fort_worth_tracts_with_rent.geojson"), None),
+    "prices":        (str(DATA_DIR / "prices.geojson"), ["monthly_rent", "lat", "lon"]),
+    "city_boundary": (CITY_BOUNDARY_GEOJSON,
+                      ["GEOID", "NAME", "NAMELSAD"]),
+}
+
+
+def dataset_source(name: str, place=None) -> str:
+    """Source file of a dataset: the place's own copy, else the shipped one."""
+    if place is not None and name in place.sources:
+        return place.sources[name]
+    return DATASETS[name][0]
+
+
+def source_key(name: str, place=None) -> tuple:
+    """(source file, content version) — for cache keys that must change with the data."""
+    src = dataset_source(name, place)
+    return str(src), dataset_version(src)
+
+
+def parquet_path(name: str, tolerance: float = 0.0, place=None) -> Path:
+    src = dataset_source(name, place)
+    lod = f"-tol{tolerance:g}" if tolerance else ""
+    return ARTIFACT_DIR / f"{Path(src).stem}-{dataset_version(src)}{lod}.parquet"
+
+
+def read_geojson(name: str, tolerance: float = 0.0, place=None):
+    """Slow path: parse the GeoJSON, reproject, prune and simplify."""
+    import geopandas as gpd
+
+    src, columns = dataset_source(name, place), DATASETS[name][1]
+    gdf = gpd.read_file(src, columns=columns).to_crs(4326)
+    if columns is not None:
+        gdf = gdf[columns + ["geometry"]]
+    if tolerance:
+        gdf = gdf.set_geometry(lod_geometries(gdf.geometry.values, tolerance),
+                               crs=gdf.crs)
+    return gdf
+
+
+def convert(name: str, tolerance: float = 0.0, place=None) -> Path:
+    """Write the GeoParquet copy of one dataset at one level of detail."""
+    out = parquet_path(name, tolerance, place)
+    ARTIFACT_DIR.mkdir(exist_ok=True)
+    tmp = temp_sibling(out)
+    read_geojson(name, tolerance, place).to_parquet(tmp, index=False)
+    tmp.replace(out)
+    return out
+
+
+def read_dataset(name: str, zoom: float = None, place=None):
+    """
+    GeoDataFrame in EPSG:4326 with the pruned columns — from GeoParquet
+    when it exists (or can be written), otherwise straight from GeoJSON.
+    With `zoom`, geometries are simplified for that map zoom.
+    """
+    import geopandas as gpd
+
+    tolerance = 0.0 if zoom is None else tolerance_for_zoom(zoom)
+    path = parquet_path(name, tolerance, place)
+    if not path.exists():
+        try:
+            convert(name, tolerance, place)
+        except (ImportError, OSError):      # no pyarrow / read-only tree
+            return read_geojson(name, tolerance, place)
+    return gpd.read_parquet(path)
+
+
+def read_attributes(name: str, columns=None, place=None) -> pd.DataFrame:
+    """
+    The non-geometry columns of a dataset as a plain DataFrame.  Reads
+    the Parquet copy with pandas alone, so the warm path never imports
+    geopandas / shapely / pyproj.
+    """
+    columns = list(columns or DATASETS[name][1] or [])
+    path = parquet_path(name, place=place)
+    if path.exists():
+        try:
+            return pd.read_parquet(path, columns=columns or None).drop(
+                columns="geometry", errors="ignore")
+        except ImportError:                 # no pyarrow
+            pass
+    gdf = read_dataset(name, place=place)
+    return pd.DataFrame(gdf[columns] if columns else gdf.drop(columns="geometry"))
+
+
+# ── per-bedroom layers over shared geometry ──────────────────────────
+@dataclass(frozen=True)
+class BedroomLayers:
+    """
+    Grid cells indexed once per rent column.  Every column shares the same
+    polygon payloads and centroids; only the row index and values differ.
+    """
+    rows: dict          # rent column → indices of cells with a real value
+    rents: dict         # rent column → values at those rows
+    polygons: dict      # rent column → PolygonLayer payload at those rows
+    centroids: np.ndarray
+
+    def frame(self, column: str) -> pd.DataFrame:
+        """Two-column layer frame (polygon, rent) for one bedroom type."""
+        return pd.DataFrame({"coordinates": self.polygons[column],
+                             column: self.rents[column]})
+
+    def center(self, column: str):
+        """Mean (lon, lat) of the cells with a value in `column`."""
+        lon, lat = np.asarray(self.centroids[self.rows[column]], dtype=float).mean(axis=0)
+        return lon, lat
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory: arrays, plus the shared polygon lists counted once."""
+        cells = {}
+        for column, idx in self.rows.items():
+            cells.update(zip(idx.tolist(), self.polygons[column]))
+        vertices = sum(len(ring) for rings in cells.values() for ring in rings)
+        refs = sum(len(p) for p in self.polygons.values())
+        return (sum(a.nbytes for a in self.rows.values())
+                + sum(a.nbytes for a in self.rents.values())
+                + int(self.centroids.nbytes)
+                + vertices * _VERTEX_BYTES + refs * 8)
+
+
+_VERTEX_BYTES = 128     # [lon, lat] list of two floats + its slot in the ring
+
+
+def bedroom_layers(name: str = "grid", zoom: float = None, place=None) -> BedroomLayers:
+    """
+    Build the per-bedroom index for a rent dataset, with polygons at the
+    level of detail for `zoom` (full detail when None).  Cells without an
+    estimate (Census sentinel -666666666, or 0) are left out of a column.
+    """
+    attrs = read_attributes(name, RENT_COLUMNS, place)
+    tolerance = 0.0 if zoom is None else tolerance_for_zoom(zoom)
+    packed = load_artifact(dataset_source(name, place), tolerance)
+    all_polygons = polygon_coordinates(packed)
+
+    rows, rents, polygons = {}, {}, {}
+    for column in RENT_COLUMNS:
+        values = attrs[column].to_numpy()
+        idx = np.flatnonzero(values > 0)
+        rows[column] = idx
+        rents[column] = values[idx]
+        polygons[column] = [all_polygons[i] for i in idx]
+    return BedroomLayers(rows, rents, polygons, packed.centroids)
+
+
+if __name__ == "__main__":
+    for name in DATASETS:
+        print(convert(name))
@@ -0,0 +1,240 @@
+# geometry.py  ────────────────────────────────────────────────────────
+# Pydeck-ready polygon buffers, built once per dataset version and level
+# of detail and kept on disk as plain .npy files that the app memory-maps.
+#
+#   python geometry.py            # (re)build every grid and tract level
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from shared_cache import CACHE
+
+# data files live next to the code, wherever the process was started
+DATA_DIR = Path(__file__).resolve().parent
+ARTIFACT_DIR = DATA_DIR / "artifacts"
+GRID_GEOJSON = str(DATA_DIR / "fort_worth_grid_pieces_bedrooms.geojson")
+TRACTS_GEOJSON = str(DATA_DIR / "fort_worth_tracts_with_rent_and_bedrooms.geojson")
+CITY_BOUNDARY_GEOJSON = str(DATA_DIR / "fort_worth_city_boundary.geojson")
+
+# map zoom → simplification tolerance in degrees (about half a pixel);
+# a zoom uses the entry of the closest table zoom at or below it
+ZOOM_TOLERANCES = {
+    6: 0.01,
+    8: 0.003,
+    10: 0.0007,
+    12: 0.0002,
+    14: 0.0,
+}
+
+_FIELDS = ("coords", "ring_offsets", "feature_offsets", "centroids")
+
+
+@dataclass(frozen=True)
+class PackedPolygons:
+    """
+    Exterior rings of every feature as flat buffers:
+    ``coords[ring_offsets[r]:ring_offsets[r + 1]]`` is ring r and
+    ``ring_offsets[feature_offsets[i]:feature_offsets[i + 1]]`` are the
+    rings of feature i (one per polygon part).
+    """
+    coords: np.ndarray           # (n_vertices, 2) float32 lon/lat
+    ring_offsets: np.ndarray     # (n_rings + 1,) int64
+    feature_offsets: np.ndarray  # (n_features + 1,) int64
+    centroids: np.ndarray        # (n_features, 2) float32 lon/lat
+    decimals: int = 6            # coordinate precision of this level
+
+    def __len__(self) -> int:
+        return len(self.feature_offsets) - 1
+
+
+_versions = {}            # (path, mtime_ns, size) → hash; a stat per call, not a read
+
+
+def dataset_version(path) -> str:
+    """Short content hash of a source file — changes whenever the data does."""
+    stat = os.stat(path)
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    version = _versions.get(key)
+    if version is None:
+        digest = hashlib.sha1()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+        version = _versions[key] = digest.hexdigest()[:12]
+    return version
+
+
+def temp_sibling(path: Path, suffix: str = "") -> Path:
+    """Temp name next to `path`, unique per process and thread, to rename into place."""
+    return path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp{suffix}")
+
+
+def _offsets(owner: np.ndarray, n: int) -> np.ndarray:
+    return np.concatenate([[0], np.cumsum(np.bincount(owner, minlength=n))])
+
+
+# ── level of detail ──────────────────────────────────────────────────
+def tolerance_for_zoom(zoom: float, table=ZOOM_TOLERANCES) -> float:
+    levels = [z for z in sorted(table) if z <= zoom] or [min(table)]
+    return table[levels[-1]]
+
+
+def decimals_for(tolerance: float) -> int:
+    """Coordinate decimals kept at a tolerance — one digit finer than it."""
+    if not tolerance:
+        return 6
+    return min(6, math.ceil(-math.log10(tolerance)) + 1)
+
+
+def lod_geometries(geoms, tolerance: float):
+    """
+    Simplify with `tolerance` and snap vertices to the level's precision.
+    Coverage simplification keeps edges shared by neighbouring cells
+    shared, so simplified grids and tracts do not open gaps or overlaps.
+    """
+    import shapely
+
+    geoms = np.asarray(geoms, dtype=object)
+    if not tolerance:
+        return geoms
+    try:
+        geoms = shapely.coverage_simplify(geoms, tolerance)
+    except (AttributeError, shapely.errors.UnsupportedGEOSVersionError):
+        geoms = shapely.simplify(geoms, tolerance, preserve_topology=True)
+    return shapely.set_precision(geoms, 10.0 ** -decimals_for(tolerance))
+
+
+def pack_polygons(geoms, tolerance: float = 0.0) -> PackedPolygons:
+    """Pack (Multi)Polygon geometries with vectorised shapely calls."""
+    import shapely
+
+    geoms = np.asarray(geoms, dtype=object)
+    centroids = shapely.get_coordinates(shapely.centroid(geoms))
+    geoms = lod_geometries(geoms, tolerance)
+    parts, part_owner = shapely.get_parts(geoms, return_index=True)
+    exteriors = shapely.get_exterior_ring(parts)
+    coords, ring_owner = shapely.get_coordinates(exteriors, return_index=True)
+
+    return PackedPolygons(
+        coords=coords.astype(np.float32),
+        ring_offsets=_offsets(ring_owner, len(parts)),
+        feature_offsets=_offsets(part_owner, len(geoms)),
+        centroids=centroids.astype(np.float32),
+        decimals=decimals_for(tolerance),
+    )
+
+
+def polygon_coordinates(packed: PackedPolygons, rows=None) -> list:
+    """
+    PolygonLayer ``get_polygon`` payload (list of rings per feature) for the
+    selected feature `rows` (all features when None).
+    """
+    # float32 → the level's decimals (6 ≈ 0.1 m, the source precision);
+    # keeps the JSON reprs short
+    flat = np.round(packed.coords.astype(np.float64), packed.decimals).tolist()
+    ring_off = packed.ring_offsets.tolist()
+    feat_off = packed.feature_offsets
+    rows = range(len(packed)) if rows is None else np.asarray(rows).tolist()
+    return [[flat[ring_off[r]:ring_off[r + 1]]
+             for r in range(feat_off[i], feat_off[i + 1])]
+            for i in rows]
+
+
+def _split(flat: list, offsets) -> list:
+    offsets = list(offsets)
+    return [flat[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def boundary_payload(geoms, tolerance: float = 0.0) -> dict:
+    """
+    PolygonLayer and path payloads for boundary geometries:
+    ``polygons`` holds one [exterior, *holes] entry per polygon part,
+    ``paths`` every ring (exterior or hole) on its own.
+    """
+    import shapely
+
+    geoms = lod_geometries(geoms, tolerance)
+    parts = shapely.get_parts(geoms)
+    rings, ring_owner = shapely.get_rings(parts, return_index=True)
+    coords, vertex_owner = shapely.get_coordinates(rings, return_index=True)
+
+    coords = np.round(coords, decimals_for(tolerance))
+    paths = _split(coords.tolist(), _offsets(vertex_owner, len(rings)))
+    polygons = _split(paths, _offsets(ring_owner, len(parts)))
+    return {"polygons": polygons, "paths": paths}
+
+
+def load_boundary(src=CITY_BOUNDARY_GEOJSON, tolerance: float = 0.0) -> dict:
+    """
+    boundary_payload for `src`, serialised to artifacts/ once per dataset
+    version and tolerance, and kept in the shared cache afterwards.
+    """
+    return CACHE.get_or_build(("boundary_payload", str(src), dataset_version(src), tolerance),
+                              lambda: _boundary_file(src, tolerance))
+
+
+def _boundary_file(src, tolerance: float) -> dict:
+    path = ARTIFACT_DIR / f"{Path(src).stem}-{dataset_version(src)}-tol{tolerance:g}.json"
+    if path.exists():
+        return json.loads(path.read_text())
+
+    import geopandas as gpd
+
+    payload = boundary_payload(gpd.read_file(src).to_crs(4326).geometry.values,
+                               tolerance)
+    ARTIFACT_DIR.mkdir(exist_ok=True)
+    tmp = temp_sibling(path)
+    tmp.write_text(json.dumps(payload, separators=(",", ":")))
+    tmp.replace(path)
+    return payload
+
+
+# ── on-disk artifact ─────────────────────────────────────────────────
+def artifact_path(src, tolerance: float = 0.0) -> Path:
+    lod = f"-tol{tolerance:g}" if tolerance else ""
+    return ARTIFACT_DIR / f"{Path(src).stem}-{dataset_version(src)}{lod}"
+
+
+def build_artifact(src=GRID_GEOJSON, tolerance: float = 0.0) -> Path:
+    """Read `src`, reproject to EPSG:4326, pack and write the artifact."""
+    import geopandas as gpd
+
+    out = artifact_path(src, tolerance)
+    gdf = gpd.read_file(src).to_crs(4326)
+    packed = pack_polygons(gdf.geometry.values, tolerance)
+
+    # write into a temp dir and rename, so readers never see half an artifact
+    ARTIFACT_DIR.mkdir(exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=ARTIFACT_DIR))
+    tmp.chmod(0o755)
+    for name in _FIELDS:
+        np.save(tmp / f"{name}.npy", getattr(packed, name))
+    try:
+        os.replace(tmp, out)
+    except OSError:            # another process won the race
+        shutil.rmtree(tmp, ignore_errors=True)
+    return out
+
+
+def load_artifact(src=GRID_GEOJSON, tolerance: float = 0.0) -> PackedPolygons:
+    """Memory-map the artifact for `src` at one LOD, building it on first use."""
+    path = artifact_path(src, tolerance)
+    if not path.is_dir():
+        build_artifact(src, tolerance)
+    return PackedPolygons(**{name: np.load(path / f"{name}.npy", mmap_mode="r")
+                             for name in _FIELDS},
+                          decimals=decimals_for(tolerance))
+
+
+if __name__ == "__main__":
+    for src in (GRID_GEOJSON, TRACTS_GEOJSON):
+        for tolerance in sorted(set(ZOOM_TOLERANCES.values())):
+            print(build_artifact(src, tolerance))
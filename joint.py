@@ -0,0 +1,150 @@
+# joint.py  ───────────────────────────────────────────────────────────
+# Joint simulation of household costs.  `living_wage` takes the same
+# percentile in every category and adds them up; here each simulated
+# household draws all categories at once from a multivariate normal with
+# a configurable correlation matrix, and percentiles are taken of the
+# household *total* (monthly net, then the tax-grossed wage).
+#
+# Rents are not normal: the housing columns go through a Gaussian copula,
+# each correlated normal mapped to its percentile and then through the
+# fitted rent CDF (rent_model), so the marginals match the grid's rents.
+# With a `place` (places.Place), its rents and cost scaling are used.
+#
+# One (households × distributions) draw is shared by all family types;
+# the scaling helpers and the tax inversion work on whole sample arrays,
+# so a model is a few NumPy passes and a percentile is an index lookup.
+import numpy as np
+import pandas as pd
+
+from city_health import city_health_draws
+from family_dataclass import family_obj
+from living_wage import (ADULTS, BEDROOMS, CHILDREN, COST_PARAMS,
+                         DISTRIBUTIONS, EARNERS, FAMILY_LABELS, FILING,
+                         civic_cost, food_cost, internet_cost, other_cost,
+                         quantiles_of_sorted, transport_cost)
+from datasets import source_key
+from rent_model import rent_cdf
+from shared_cache import CACHE
+from taxes import gross_from_net_array
+
+HOUSEHOLDS = 20_000
+_HOUSING = [DISTRIBUTIONS.index(f"housing_{br}br") for br in (1, 2, 3)]
+
+
+def _normal_cdf(z) -> np.ndarray:
+    """
+    Standard normal CDF on whole arrays: Hart's double-precision rational
+    approximation (West 2005); absolute error at most ~2.2e-16.
+    """
+    z = np.asarray(z, dtype=float)
+    x = np.abs(z)
+    e = np.exp(-0.5 * x * x)
+    num = ((((((0.0352624965998911 * x + 0.700383064443688) * x + 6.37396220353165) * x
+              + 33.912866078383) * x + 112.079291497871) * x + 221.213596169931) * x
+           + 220.206867912376)
+    den = (((((((0.0883883476483184 * x + 1.75566716318264) * x + 16.064177579207) * x
+               + 86.7807322029461) * x + 296.564248779674) * x + 637.333633378831) * x
+            + 793.826512519948) * x + 440.413735824752)
+    tail = x + 0.65                                   # continued fraction, |z| ≥ 7.07
+    for k in (4.0, 3.0, 2.0, 1.0):
+        tail = x + k / tail
+    lower = np.where(x < 7.07106781186547, e * num / den, e / tail / 2.506628274631)
+    lower = np.where(x < 37.0, lower, 0.0)
+    return np.where(z > 0, 1.0 - lower, lower)
+
+
+def correlation_matrix(rho: float = 0.3, housing_rho: float = 0.9,
+                       overrides: dict = None) -> np.ndarray:
+    """
+    Correlation over DISTRIBUTIONS: `rho` between any two categories,
+    `housing_rho` among the 1/2/3-bedroom rents (one market), and any
+    {(name, name): r} `overrides`.
+    """
+    corr = np.full((len(DISTRIBUTIONS), len(DISTRIBUTIONS)), float(rho))
+    corr[np.ix_(_HOUSING, _HOUSING)] = housing_rho
+    for (a, b), r in (overrides or {}).items():
+        i, j = DISTRIBUTIONS.index(a), DISTRIBUTIONS.index(b)
+        corr[i, j] = corr[j, i] = r
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+DEFAULT_CORRELATION = correlation_matrix()
+
+
+class JointModel:
+    """
+    `households` correlated draws per family type, reduced to sorted
+    (family × household) arrays of total monthly net and annual gross.
+    Category costs are floored at zero.
+    """
+
+    def __init__(self, correlation=None, households: int = HOUSEHOLDS,
+                 seed: int = 42, include_tax: bool = True, place=None):
+        corr = DEFAULT_CORRELATION if correlation is None else np.asarray(correlation, dtype=float)
+        try:
+            chol = np.linalg.cholesky(corr)
+        except np.linalg.LinAlgError as err:
+            raise ValueError("correlation matrix is not positive definite") from err
+        params = COST_PARAMS if place is None else place.cost_params()
+        mean, sd = (np.array(col, dtype=float) for col in zip(*(params[d] for d in DISTRIBUTIONS)))
+
+        rng = np.random.default_rng(seed)
+        z = rng.standard_normal((households, len(DISTRIBUTIONS))) @ chol.T
+        base = dict(zip(DISTRIBUTIONS, np.maximum(mean + sd * z, 0.0).T[:, :, None]))  # (n, 1) each
+        for br, col in zip((1, 2, 3), _HOUSING):
+            base[f"housing_{br}br"] = rent_cdf(br, place=place).quantile(_normal_cdf(z[:, col]))[:, None]
+
+        housing = np.stack([base[f"housing_{br}br"][:, 0] for br in BEDROOMS], axis=1)
+        health = np.stack([city_health_draws(family_obj(a, c, e), households, seed)
+                           for a, c, e in zip(ADULTS, CHILDREN, EARNERS)], axis=1)
+        care = np.where((ADULTS == 2) & (EARNERS == 1), 0.0, base["childcare"] * CHILDREN)
+
+        monthly_net = (housing + health + care
+                       + transport_cost(base["transport"], EARNERS, CHILDREN)
+                       + food_cost(base["food"], ADULTS, CHILDREN)
+                       + civic_cost(base["civic"], ADULTS, CHILDREN)
+                       + other_cost(base["other"], ADULTS, CHILDREN)
+                       + internet_cost(base["internet"], ADULTS))            # (n, F)
+
+        annual_net = monthly_net.T * 12                                      # (F, n)
+        annual_gross = annual_net.copy()
+        if include_tax:
+            for j, (children, earners, filing) in enumerate(zip(CHILDREN, EARNERS, FILING)):
+                annual_gross[j], _ = gross_from_net_array(
+                    annual_net[j], filing=filing, children=children, earners=earners)
+
+        self.households = households
+        self.monthly_net = np.sort(monthly_net.T, axis=1)
+        self.annual_gross = np.sort(annual_gross, axis=1)
+
+    def quantiles(self, qs):
+        """(monthly net, annual gross), each (percentile × family)."""
+        return (quantiles_of_sorted(self.monthly_net, qs).T,
+                quantiles_of_sorted(self.annual_gross, qs).T)
+
+    def table(self, q: float = 0.5) -> pd.DataFrame:
+        """Same columns as living_wage_table, for household-total percentile q."""
+        net, gross = (a[0] for a in self.quantiles([q]))
+        return (pd.DataFrame({
+                    "Family Type": FAMILY_LABELS,
+                    "Bedrooms": BEDROOMS,
+                    "Monthly Net ($)": net.round(0),
+                    "Monthly Gross ($)": (gross / 12).round(0),
+                    "Annual Gross ($)": gross.round(0),
+                    "Living Wage ($/hr)": (gross / (2080 * EARNERS)).round(2),
+                })
+                .set_index("Family Type")
+                .sort_index())
+
+
+def joint_model(rho: float = 0.3, housing_rho: float = 0.9,
+                households: int = HOUSEHOLDS, seed: int = 42, place=None) -> JointModel:
+    """Process-wide JointModel for a uniform correlation setting (shared cache)."""
+    return CACHE.get_or_build(
+        ("joint_model", rho, housing_rho, households, seed, place, source_key("grid", place)),
+        lambda: JointModel(correlation_matrix(rho, housing_rho), households, seed, place=place))
+
+
+def joint_living_wage_table(q: float = 0.5, rho: float = 0.3) -> pd.DataFrame:
+    return joint_model(rho).table(q)
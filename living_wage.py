@@ -179,52 +179,135 @@
 # ────────────────────────────────────────────────────────────────────
 # living_wage.py   (spending model + updated gross‑up)
 # ────────────────────────────────────────────────────────────────────
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
-from taxes import gross_from_net            # ← NEW signature!
+from taxes import DEFAULT_POLICY, gross_from_net_array
 from family_dataclass import family_obj      # unchanged
 from city_health import city_health_monthly  # unchanged
+import rent_model
+
+
+# bump whenever a change to the model alters its numbers (cache key)
+MODEL_VERSION = "2025.2"      # housing from the grid's rent CDFs
 
 
 # -------------------------------------------------------------------
-# 1 ▪︎ Monthly cost distributions  (10 000 draws each)
+# 1 ▪︎ Monthly cost distributions  (10 000 draws each, on first use)
 # -------------------------------------------------------------------
-rng = np.random.default_rng(seed=42)
+# (mean, sd) of every monthly cost distribution; this order is the row
+# order of DISTRIBUTIONS and the draw order.  The housing normals are
+# kept for the legacy draws only: the model's housing quantiles come
+# from rent_model (area-weighted ACS rents), see cost_params().
+COST_PARAMS = {
+    "transport":   ((113.86 + 121.3 + 122.66 + 100.17), 150),
+    "food":        (382.5, 140),
+    "health":      ((33.33 + 11.67 + 66.33), 50),
+    "civic":       (215, 150),
+    "other":       (314, 100),
+    "childcare":   (889, 200),
+    "internet":    (100, 30),
+    "housing_1br": (1530, 250),
+    "housing_2br": (1830, 275),
+    "housing_3br": (2220, 300),
+}
 
-transport_monthly = rng.normal((113.86 + 121.3 + 122.66 + 100.17), 150, 10_000)
-food_monthly      = rng.normal(382.5, 140, 10_000)
-health_monthly    = rng.normal((33.33 + 11.67 + 66.33), 50, 10_000)
-civic_monthly     = rng.normal(215, 150, 10_000)
-other_monthly     = rng.normal(314, 100, 10_000)
-childcare_monthly = rng.normal(889, 200, 10_000)
-internet_monthly  = rng.normal(100, 30, 10_000)
+DISTRIBUTIONS = tuple(COST_PARAMS)
+DRAWS = 10_000
+_HOUSING_ROW = {1: 7, 2: 8, 3: 9}
+
+# the arrays the model used to draw at import time, by their old names
+_DRAW_NAMES = {
+    "transport_monthly": "transport", "food_monthly": "food",
+    "health_monthly": "health", "civic_monthly": "civic",
+    "other_monthly": "other", "childcare_monthly": "childcare",
+    "internet_monthly": "internet", "housing_1br": "housing_1br",
+    "housing_2br": "housing_2br", "housing_3br": "housing_3br",
+}
 
-housing_1br = rng.normal(1530, 250, 10_000)
-housing_2br = rng.normal(1830, 275, 10_000)
-housing_3br = rng.normal(2220, 300, 10_000)
 
-def housing_quantile(q: float, bedrooms: int) -> float:
-    arr = {1: housing_1br, 2: housing_2br, 3: housing_3br}[bedrooms]
-    return float(np.quantile(arr, q))
+@lru_cache(maxsize=1)
+def cost_draws() -> np.ndarray:
+    """
+    (distribution × DRAWS) samples, one row per DISTRIBUTIONS entry.
+    Drawn on first use (same seed and order as the old import-time draws)
+    and shared read-only afterwards.
+    """
+    rng = np.random.default_rng(seed=42)
+    draws = np.vstack([rng.normal(*COST_PARAMS[name], DRAWS) for name in DISTRIBUTIONS])
+    draws.flags.writeable = False
+    return draws
+
+@lru_cache(maxsize=1)
+def _sorted_draws() -> np.ndarray:
+    # every distribution sorted once → quantiles are index lookups
+    ordered = np.sort(cost_draws(), axis=1)
+    ordered.flags.writeable = False
+    return ordered
+
+def __getattr__(name):
+    # `living_wage.food_monthly` etc. still work, sampled lazily
+    if name in _DRAW_NAMES:
+        return cost_draws()[DISTRIBUTIONS.index(_DRAW_NAMES[name])]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def quantiles_of_sorted(ordered: np.ndarray, qs) -> np.ndarray:
+    """
+    (row × percentile) quantiles of an array sorted along its last axis.
+    Same linear interpolation as ``np.quantile``.
+    """
+    qs = np.atleast_1d(np.asarray(qs, dtype=float))
+    n = ordered.shape[1]
+    pos = qs * (n - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+    frac = pos - lo
+    below, above = ordered[:, lo], ordered[:, hi]
+    return below + (above - below) * frac
+
+def sorted_quantiles(qs, place=None) -> np.ndarray:
+    """
+    (distribution × percentile) quantiles for every row of DISTRIBUTIONS:
+    the draws for the non-housing rows, the fitted rent CDFs for housing
+    (of `place`'s grid when given).
+    """
+    quant = quantiles_of_sorted(_sorted_draws(), qs)
+    for bedrooms, row in _HOUSING_ROW.items():
+        quant[row] = rent_model.housing_quantile(np.atleast_1d(qs), bedrooms, place=place)
+    return quant
+
+def housing_quantile(q: float, bedrooms: int, tracts=None, place=None) -> float:
+    """Area-weighted rent quantile, 0 to 4+ bedrooms, optionally for some tracts."""
+    return float(rent_model.housing_quantile(q, bedrooms, tracts, place))
+
+def cost_params(place=None) -> dict:
+    """COST_PARAMS with housing (mean, sd) taken from the fitted rent CDFs."""
+    params = dict(COST_PARAMS)
+    for bedrooms in _HOUSING_ROW:
+        cdf = rent_model.rent_cdf(bedrooms, place=place)
+        params[f"housing_{bedrooms}br"] = (cdf.mean, cdf.sd)
+    return params
 
 
 # -------------------------------------------------------------------
-# 2 ▪︎ Scaling helpers
+# 2 ▪︎ Scaling helpers  (scalars or NumPy arrays)
 # -------------------------------------------------------------------
 def food_cost(base, adults, children):
-    return base * (1 + 0.8 * max(adults - 1, 0) + 0.6 * children)
+    return base * (1 + 0.8 * np.maximum(adults - 1, 0) + 0.6 * children)
 
 def transport_cost(base, earners, children):
-    return base * (1 + 0.9 * max(earners - 1, 0)) * (1 + 0.10 * children)
+    return base * (1 + 0.9 * np.maximum(earners - 1, 0)) * (1 + 0.10 * children)
 
 def civic_cost(base, adults, children):
-    return base * (1 + 0.5 * max(adults - 1, 0) + 0.3 * children)
+    return base * (1 + 0.5 * np.maximum(adults - 1, 0) + 0.3 * children)
 
 def other_cost(base, adults, children):
-    return base * (1 + 0.75 * max(adults - 1, 0) + 0.5 * children)
+    return base * (1 + 0.75 * np.maximum(adults - 1, 0) + 0.5 * children)
 
 def internet_cost(base, adults):
-    return base * (1 + 0.40 * max(adults - 1, 0))
+    return base * (1 + 0.40 * np.maximum(adults - 1, 0))
 
 def bedrooms_required(adults, children):
     if children == 0:
@@ -234,15 +317,8 @@ def bedrooms_required(adults, children):
     return 3
 
 def category_quantile(q):
-    return {
-        "transport":  np.quantile(transport_monthly, q),
-        "food":       np.quantile(food_monthly,      q),
-        "health":     np.quantile(health_monthly,    q),
-        "civic":      np.quantile(civic_monthly,     q),
-        "other":      np.quantile(other_monthly,     q),
-        "childcare":  np.quantile(childcare_monthly, q),
-        "internet":   np.quantile(internet_monthly,  q),
-    }
+    values = sorted_quantiles(q)[:, 0]
+    return dict(zip(DISTRIBUTIONS[:7], values[:7]))
 
 
 # -------------------------------------------------------------------
@@ -263,51 +339,86 @@ family_types = {
     "2 Adults (2 Working) 3 Children": (2, 3, 2),
 }
 
+FAMILY_LABELS = tuple(family_types)
+ADULTS, CHILDREN, EARNERS = (np.array(col) for col in zip(*family_types.values()))
+BEDROOMS = np.array([bedrooms_required(a, c) for a, c in zip(ADULTS, CHILDREN)])
+FILING = tuple("married" if a == 2 else "hoh" if c > 0 else "single"
+               for a, c in zip(ADULTS, CHILDREN))
+
 
 # -------------------------------------------------------------------
-# 4 ▪︎ Living‑wage table generator
+# 4 ▪︎ Batched engine  (percentile × family × category)
 # -------------------------------------------------------------------
-def living_wage_table(q: float = 0.5) -> pd.DataFrame:
-    base = category_quantile(q)
-    rows = []
-
-    for label, (adults, children, earners) in family_types.items():
-        fam = family_obj(adults, children, earners)  # if you still need it
-        br = bedrooms_required(adults, children)
-        rent = housing_quantile(q, br)
-
-        # variable buckets
-        health    = city_health_monthly(fam)
-        transport = transport_cost(base["transport"], earners, children)
-        food      = food_cost(base["food"], adults, children)
-        civic     = civic_cost(base["civic"], adults, children)
-        other     = other_cost(base["other"], adults, children)
-        care      = 0 if (adults == 2 and earners == 1) else base["childcare"] * children
-        internet  = internet_cost(base["internet"], adults)
-
-        monthly_net = rent + transport + food + health + civic + other + care + internet
-
-        # --- UPDATED TAX GROSS‑UP ------------------------------------
-        filing = ("married" if adults == 2
-                  else "hoh" if children > 0
-                  else "single")
-
-        annual_gross, _ = gross_from_net(
-            monthly_net * 12,
-            filing=filing,
-            children=children,
-            earners=earners
+CATEGORIES = ("housing", "transport", "food", "health",
+              "civic", "other", "childcare", "internet")
+
+def cost_cube(qs, quantiles=None) -> np.ndarray:
+    """
+    Monthly cost of every CATEGORY for every family type at every
+    percentile in `qs`.  Shape: (len(qs), len(FAMILY_LABELS), len(CATEGORIES)).
+    `quantiles` overrides the (distribution × percentile) draw quantiles,
+    e.g. with Monte Carlo estimates or their confidence bounds.
+    """
+    quant = sorted_quantiles(qs) if quantiles is None else np.asarray(quantiles)
+    base = dict(zip(DISTRIBUTIONS, quant[:, :, None]))  # each (P, 1)
+    n_q = quant.shape[1]
+
+    housing = quant[[_HOUSING_ROW[br] for br in BEDROOMS]].T
+    health = np.array([city_health_monthly(family_obj(a, c, e))
+                       for a, c, e in family_types.values()])
+    care = np.where((ADULTS == 2) & (EARNERS == 1), 0.0,
+                    base["childcare"] * CHILDREN)
+
+    return np.stack([
+        housing,
+        transport_cost(base["transport"], EARNERS, CHILDREN),
+        food_cost(base["food"], ADULTS, CHILDREN),
+        np.broadcast_to(health, (n_q, len(FAMILY_LABELS))),
+        civic_cost(base["civic"], ADULTS, CHILDREN),
+        other_cost(base["other"], ADULTS, CHILDREN),
+        care,
+        internet_cost(base["internet"], ADULTS),
+    ], axis=-1)
+
+def living_wage_cube(qs, include_tax: bool = True, quantiles=None,
+                     policy=DEFAULT_POLICY):
+    """
+    Return ``(costs, annual_gross)`` for every percentile in `qs`:
+    costs is the cost_cube, annual_gross is (percentile × family) after
+    the federal tax gross‑up (or plain net × 12 without tax) under the
+    taxes.TaxPolicy `policy`.
+    """
+    costs = cost_cube(qs, quantiles)
+    annual_net = costs.sum(axis=-1) * 12
+    if not include_tax:
+        return costs, annual_net
+
+    annual_gross = np.empty_like(annual_net)
+    for j, (children, earners, filing) in enumerate(zip(CHILDREN, EARNERS, FILING)):
+        annual_gross[:, j], _ = gross_from_net_array(
+            annual_net[:, j], filing=filing, children=children, earners=earners,
+            policy=policy
         )
+    return costs, annual_gross
 
-        hourly = annual_gross / (2080 * earners)
 
-        rows.append({
-            "Family Type": label,
-            "Bedrooms": br,
-            "Monthly Net ($)": round(monthly_net, 0),
-            "Monthly Gross ($)": round(annual_gross / 12, 0),
-            "Annual Gross ($)": round(annual_gross, 0),
-            "Living Wage ($/hr)": round(hourly, 2),
-        })
+# -------------------------------------------------------------------
+# 5 ▪︎ Living‑wage table generator
+# -------------------------------------------------------------------
+def table_from_cube(costs: np.ndarray, annual_gross: np.ndarray) -> pd.DataFrame:
+    """Living-wage table for one percentile slice of living_wage_cube."""
+    monthly_net = costs.sum(axis=-1)
+    return (pd.DataFrame({
+                "Family Type": FAMILY_LABELS,
+                "Bedrooms": BEDROOMS,
+                "Monthly Net ($)": monthly_net.round(0),
+                "Monthly Gross ($)": (annual_gross / 12).round(0),
+                "Annual Gross ($)": annual_gross.round(0),
+                "Living Wage ($/hr)": (annual_gross / (2080 * EARNERS)).round(2),
+            })
+            .set_index("Family Type")
+            .sort_index())
 
-    return pd.DataFrame(rows).set_index("Family Type").sort_index()
+def living_wage_table(q: float = 0.5) -> pd.DataFrame:
+    costs, annual_gross = living_wage_cube([q])
+    return table_from_cube(costs[0], annual_gross[0])
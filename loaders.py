@@ -0,0 +1,35 @@
+# loaders.py  ─────────────────────────────────────────────────────────
+# The app's per-place data, loaded through the process-wide
+# shared_cache.CACHE so every session — and the background warm-up
+# (warmup.py) — shares one copy under the same keys.
+import pandas as pd
+
+from datasets import bedroom_layers, dataset_source, source_key
+from geometry import load_boundary, tolerance_for_zoom
+from joint import joint_model
+from shared_cache import CACHE
+
+MAP_ZOOM = 10
+DEFAULT_BUDGET = 1450          # the app's housing input default, $/mo
+
+
+def grid_layers(place, zoom: float = MAP_ZOOM):
+    """Shared polygons (simplified for the zoom) + a row index per bedroom column."""
+    return CACHE.get_or_build(("grid_layers", *source_key("grid", place), zoom),
+                              lambda: bedroom_layers("grid", zoom=zoom, place=place))
+
+
+def city_boundary(place, zoom: float = MAP_ZOOM):
+    """(polygon frame, line frame) boundary payloads for PolygonLayer / LineLayer."""
+    def build():
+        payload = load_boundary(dataset_source("city_boundary", place),
+                                tolerance=tolerance_for_zoom(zoom))
+        return (pd.DataFrame({"coordinates": payload["polygons"]}),
+                pd.DataFrame({"path": payload["paths"]}))
+    return CACHE.get_or_build(("city_boundary", *source_key("city_boundary", place), zoom),
+                              build)
+
+
+def joint_for(place):
+    """Correlated household draws for every family type."""
+    return joint_model(place=place)
@@ -0,0 +1,100 @@
+# lookup.py  ──────────────────────────────────────────────────────────
+# Bulk "is this location affordable?" queries against the rent grid.
+#
+#   python lookup.py sites.csv --family "1 Adult 2 Children" --q 0.4 -o out.csv
+#
+# The CSV needs `lon` and `lat` columns (EPSG:4326).  The STRtree over the
+# grid is built once per process; each query is one vectorised
+# point-in-polygon pass, so 100k points take a fraction of a second.
+import argparse
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from datasets import RENT_COLUMNS, bedroom_column, read_dataset
+from living_wage import BEDROOMS, FAMILY_LABELS
+from wage_cache import cached_breakdown
+
+
+class AffordabilityLookup:
+    """Point → grid cell index with the cell's rents, for one dataset."""
+
+    def __init__(self, name: str = "grid"):
+        import shapely
+
+        gdf = read_dataset(name)
+        self.tree = shapely.STRtree(gdf.geometry.values)
+        self.tract = gdf["tract"].to_numpy()
+        self.county = gdf["county"].to_numpy()
+        # float so cells without an estimate become NaN, not -666666666
+        self.rents = {col: np.where(gdf[col].to_numpy() > 0, gdf[col].to_numpy(), np.nan)
+                      for col in RENT_COLUMNS}
+
+    def locate(self, lon, lat) -> np.ndarray:
+        """Cell index for every point; -1 when it falls outside the grid."""
+        import shapely
+
+        points = shapely.points(np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+        pt_idx, cell_idx = self.tree.query(points, predicate="intersects")
+        # points on a shared edge hit two cells — keep the first
+        pt_idx, first = np.unique(pt_idx, return_index=True)
+        cells = np.full(len(points), -1, dtype=np.int64)
+        cells[pt_idx] = cell_idx[first]
+        return cells
+
+    def query(self, lon, lat, family_type: str, q: float = 0.40,
+              bedroom_col: str = None) -> pd.DataFrame:
+        """
+        One row per point: the containing cell, its rent for the family's
+        bedroom count (or `bedroom_col`), the family's housing budget from
+        living_wage_breakdown at percentile `q`, and whether it fits.
+        """
+        if bedroom_col is None:
+            bedroom_col = bedroom_column(BEDROOMS[FAMILY_LABELS.index(family_type)])
+        budget = cached_breakdown(q).loc[family_type, "housing"]
+
+        cells = self.locate(lon, lat)
+        inside = cells >= 0
+        safe = np.where(inside, cells, 0)
+        rent = np.where(inside, self.rents[bedroom_col][safe], np.nan)
+
+        return pd.DataFrame({
+            "lon": lon,
+            "lat": lat,
+            "cell": cells,
+            "tract": np.where(inside, self.tract[safe], None),
+            "county": np.where(inside, self.county[safe], None),
+            "rent": rent,
+            "housing_budget": budget,
+            "rent_gap": rent - budget,
+            "affordable": rent <= budget,     # False when rent is unknown
+        })
+
+
+@lru_cache(maxsize=4)
+def get_lookup(name: str = "grid") -> AffordabilityLookup:
+    """Process-wide AffordabilityLookup (the STRtree is built once)."""
+    return AffordabilityLookup(name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Affordability of many lon/lat points for one family type.")
+    parser.add_argument("points", help="CSV with lon and lat columns")
+    parser.add_argument("--family", required=True, choices=FAMILY_LABELS)
+    parser.add_argument("--q", type=float, default=0.40, help="living-wage percentile")
+    parser.add_argument("--bedrooms", choices=RENT_COLUMNS,
+                        help="rent column (default: the family's bedroom count)")
+    parser.add_argument("-o", "--output", default="affordability.csv")
+    args = parser.parse_args(argv)
+
+    pts = pd.read_csv(args.points)
+    result = get_lookup().query(pts["lon"].to_numpy(), pts["lat"].to_numpy(),
+                                args.family, args.q, args.bedrooms)
+    result.to_csv(args.output, index=False)
+    print(f"{len(result)} points, {int(result['affordable'].sum())} affordable → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
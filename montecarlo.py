@@ -0,0 +1,166 @@
+# montecarlo.py  ──────────────────────────────────────────────────────
+# Streaming Monte Carlo for the living-wage model: draw the monthly cost
+# distributions in chunks, fold each chunk into a fixed-size quantile
+# sketch, and stop as soon as every living wage is pinned down to the
+# requested precision.
+#
+#   python montecarlo.py --q 0.4 --precision 0.05      # ±5¢/hr, 95 %
+#
+# Memory is one chunk of draws plus the sketch (distributions × bins
+# counters), whatever the number of draws.  Confidence intervals are the
+# distribution-free order-statistic ones: the q-quantile lies between the
+# sample quantiles at q ∓ z·sqrt(q(1−q)/n).  The living wage is increasing
+# in every cost quantile, so evaluating the model at all lower / all upper
+# bounds brackets it; the per-distribution level is Bonferroni-adjusted.
+#
+# Housing rows are drawn by inverse transform from the fitted rent CDFs
+# (rent_model); the other categories stay normal.
+import argparse
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from living_wage import (_HOUSING_ROW, COST_PARAMS, DISTRIBUTIONS, EARNERS,
+                         FAMILY_LABELS, living_wage_cube)
+from rent_model import rent_cdf
+
+SKETCH_BINS = 8192
+SKETCH_SPAN = 8.0         # sketch covers mean ± SPAN·sd; the rest is clamped
+
+
+class HistogramSketch:
+    """
+    Fixed-bin streaming quantile sketch for several variables at once.
+    Quantiles interpolate linearly inside a bin, so the error is below one
+    bin width; sketches over the same ranges merge by adding counts.
+    """
+
+    def __init__(self, lo, hi, bins: int = SKETCH_BINS):
+        self.lo = np.asarray(lo, dtype=float)
+        self.hi = np.asarray(hi, dtype=float)
+        self.bins = bins
+        self.width = (self.hi - self.lo) / bins
+        self.counts = np.zeros((len(self.lo), bins), dtype=np.int64)
+        self.n = 0
+
+    def update(self, samples: np.ndarray) -> None:
+        """Add a (variables × m) chunk."""
+        idx = np.floor((samples - self.lo[:, None]) / self.width[:, None])
+        idx = np.clip(idx, 0, self.bins - 1).astype(np.int64)
+        idx += np.arange(len(self.lo))[:, None] * self.bins
+        self.counts += np.bincount(idx.ravel(), minlength=self.counts.size
+                                   ).reshape(self.counts.shape)
+        self.n += samples.shape[1]
+
+    def merge(self, other: "HistogramSketch") -> None:
+        self.counts += other.counts
+        self.n += other.n
+
+    def quantile(self, qs) -> np.ndarray:
+        """(variables × len(qs)) quantile estimates."""
+        qs = np.clip(np.atleast_1d(np.asarray(qs, dtype=float)), 0.0, 1.0)
+        cum = np.cumsum(self.counts, axis=1)
+        rank = qs * self.n
+        out = np.empty((len(self.lo), len(qs)))
+        for d in range(len(self.lo)):
+            b = np.minimum(np.searchsorted(cum[d], rank, side="left"), self.bins - 1)
+            before = cum[d, b] - self.counts[d, b]
+            inside = np.divide(rank - before, self.counts[d, b],
+                               out=np.zeros(len(qs)), where=self.counts[d, b] > 0)
+            out[d] = self.lo[d] + (b + np.clip(inside, 0.0, 1.0)) * self.width[d]
+        return out
+
+
+@dataclass
+class MonteCarloResult:
+    table: pd.DataFrame       # percentile × family: estimate, lower, upper
+    draws: int
+    converged: bool
+    confidence: float
+
+
+def _wage_bounds(sketch: HistogramSketch, qs: np.ndarray, z: float, include_tax: bool):
+    """(point, lower, upper) annual gross, each (percentile × family)."""
+    se = z * np.sqrt(qs * (1 - qs) / sketch.n)
+    out = []
+    for shift in (0.0, -1.0, 1.0):
+        quant = sketch.quantile(qs + shift * se)
+        _, annual = living_wage_cube(qs, include_tax, quantiles=quant)
+        out.append(annual)
+    return out
+
+
+def simulate(qs=(0.5,), precision: float = 0.05, confidence: float = 0.95,
+             chunk: int = 200_000, max_draws: int = 20_000_000,
+             min_draws: int = 1_000_000, seed: int = 42,
+             include_tax: bool = True) -> MonteCarloResult:
+    """
+    Draw in chunks until the confidence interval of every hourly living
+    wage is at most ±`precision` dollars (or `max_draws` is reached).
+    """
+    qs = np.asarray(qs, dtype=float)
+    mean, sd = (np.array(col, dtype=float) for col in zip(*(COST_PARAMS[d] for d in DISTRIBUTIONS)))
+    lo, hi = mean - SKETCH_SPAN * sd, mean + SKETCH_SPAN * sd
+    cdfs = {row: rent_cdf(br) for br, row in _HOUSING_ROW.items()}
+    for row, cdf in cdfs.items():
+        lo[row], hi[row] = cdf.values[0], cdf.values[-1]
+    normal = np.array([d for d in range(len(DISTRIBUTIONS)) if d not in cdfs])
+    sketch = HistogramSketch(lo, hi)
+    rng = np.random.default_rng(seed)
+    alpha = (1 - confidence) / len(DISTRIBUTIONS)          # Bonferroni
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    hours = 2080 * EARNERS
+
+    converged = False
+    while sketch.n < max_draws:
+        m = min(chunk, max_draws - sketch.n)
+        # normals only for the non-housing rows; housing by inverse rent CDF
+        samples = np.empty((len(mean), m))
+        samples[normal] = rng.normal(mean[normal, None], sd[normal, None], (len(normal), m))
+        for (row, cdf), u in zip(cdfs.items(), rng.random((len(cdfs), m))):
+            samples[row] = cdf.quantile(u)
+        sketch.update(samples)
+        if sketch.n < min_draws:
+            continue
+        point, lower, upper = _wage_bounds(sketch, qs, z, include_tax)
+        if np.all((upper - lower) / hours / 2 <= precision):
+            converged = True
+            break
+    else:
+        point, lower, upper = _wage_bounds(sketch, qs, z, include_tax)
+
+    index = pd.MultiIndex.from_product([np.round(qs, 4), FAMILY_LABELS],
+                                       names=["percentile", "Family Type"])
+    table = pd.DataFrame({
+        "Annual Gross ($)": point.ravel(),
+        "Annual Gross Low ($)": lower.ravel(),
+        "Annual Gross High ($)": upper.ravel(),
+        "Living Wage ($/hr)": (point / hours).ravel(),
+        "Living Wage Low ($/hr)": (lower / hours).ravel(),
+        "Living Wage High ($/hr)": (upper / hours).ravel(),
+    }, index=index).round(2)
+    return MonteCarloResult(table, sketch.n, converged, confidence)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Living wage with confidence intervals from streaming Monte Carlo.")
+    parser.add_argument("--q", type=float, action="append", help="percentile (repeatable)")
+    parser.add_argument("--precision", type=float, default=0.05, help="± $/hr target")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--max-draws", type=int, default=20_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    result = simulate(args.q or [0.5], args.precision, args.confidence,
+                      max_draws=args.max_draws, seed=args.seed)
+    status = "converged" if result.converged else "max draws reached"
+    print(f"{result.draws:,} draws per distribution ({status}, "
+          f"{result.confidence:.0%} intervals)")
+    print(result.table.to_string())
+
+
+if __name__ == "__main__":
+    main()
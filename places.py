@@ -0,0 +1,184 @@
+# places.py  ──────────────────────────────────────────────────────────
+# Registry of the places the explorer can show.  A Place names its grid,
+# tract and boundary files and its cost-model adjustments; datasets,
+# rent_model, zonal, joint, wage_cache and tiles take it as `place` and
+# read that place's files instead of the shipped Fort Worth ones.
+#
+# Fort Worth ships with the repo.  Any other Texas place in the TIGER
+# place table (tl_2023_48_place.dbf) can be looked up by name; its files
+# are built on first request (build_data: TIGER tracts + places → grid
+# pieces and tracts with ACS rents) into artifacts/places/.  Building
+# needs the TIGER .shp/.shx files next to the .dbf files, and ACS rents
+# from the CSV in LW_ACS_CSV or from the Census API.
+#
+#   place = get_place("Dallas")        # registry entry, nothing loaded yet
+#   ensure_built(place)                # writes its files once
+#   read_dataset("grid", place=place)
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from build_data import PLACES_SHP, TRACTS_SHP, place_slug
+from geometry import (ARTIFACT_DIR, CITY_BOUNDARY_GEOJSON, DATA_DIR, GRID_GEOJSON,
+                      TRACTS_GEOJSON)
+from living_wage import COST_PARAMS, DISTRIBUTIONS, sorted_quantiles
+
+PLACES_DBF = str(DATA_DIR / "tl_2023_48_place.dbf")
+PLACES_DIR = ARTIFACT_DIR / "places"
+DEFAULT_PLACE = "fort-worth"
+
+
+@dataclass(frozen=True)
+class Place:
+    slug: str
+    name: str                  # TIGER NAME, e.g. "Fort Worth"
+    geoid: str                 # state + place FIPS, e.g. "4827000"
+    namelsad: str              # TIGER NAMELSAD, e.g. "Fort Worth city"
+    files: tuple = ()          # (dataset name, path) pairs
+    cost_scale: tuple = ()     # (distribution, factor) pairs; not housing
+
+    @property
+    def sources(self) -> dict:
+        return dict(self.files)
+
+    @property
+    def census_url(self) -> str:
+        profile = f"{self.namelsad},_Texas".replace(" ", "_")
+        return f"https://data.census.gov/profile/{profile}?g=160XX00US{self.geoid}"
+
+    def cost_params(self) -> dict:
+        """COST_PARAMS with (mean, sd) scaled by `cost_scale`."""
+        params = dict(COST_PARAMS)
+        for dist, factor in self.cost_scale:
+            mean, sd = params[dist]
+            params[dist] = (mean * factor, sd * factor)
+        return params
+
+    def cost_quantiles(self, qs) -> np.ndarray:
+        """
+        (distribution × percentile) quantiles: housing from this place's
+        rent CDFs, the other categories scaled by `cost_scale`.
+        """
+        quant = sorted_quantiles(qs, place=self)
+        for dist, factor in self.cost_scale:
+            quant[DISTRIBUTIONS.index(dist)] *= factor
+        return quant
+
+
+def _built_files(name: str) -> tuple:
+    """Where build_place writes a place's datasets (build_data's names)."""
+    stem = PLACES_DIR / place_slug(name)
+    return (("grid", str(stem) + "_grid_pieces_bedrooms.geojson"),
+            ("tracts", str(stem) + "_tracts_with_bedroom_rent.geojson"),
+            ("city_boundary", str(stem) + "_city_boundary.geojson"))
+
+
+def _place(name: str, geoid: str, namelsad: str, files: tuple = None,
+           cost_scale: tuple = ()) -> Place:
+    slug = name.strip().lower().replace(" ", "-")
+    return Place(slug, name, geoid, namelsad,
+                 files if files is not None else _built_files(name), cost_scale)
+
+
+# places offered in the app; cost_scale is left at 1 until there are
+# local price data for a place
+PLACES = {p.slug: p for p in (
+    _place("Fort Worth", "4827000", "Fort Worth city",
+           files=(("grid", GRID_GEOJSON), ("tracts", TRACTS_GEOJSON),
+                  ("city_boundary", CITY_BOUNDARY_GEOJSON))),
+    _place("Dallas", "4819000", "Dallas city"),
+    _place("Arlington", "4804000", "Arlington city"),
+)}
+
+
+@lru_cache(maxsize=1)
+def place_index():
+    """GEOID / NAME / NAMELSAD of every place in the TIGER place table."""
+    import geopandas as gpd
+
+    return gpd.read_file(PLACES_DBF, columns=["GEOID", "NAME", "NAMELSAD"],
+                         ignore_geometry=True)
+
+
+@lru_cache(maxsize=None)
+def get_place(key: str) -> Place:
+    """Registry entry for a slug, TIGER place name or GEOID."""
+    slug = key.strip().lower().replace(" ", "-")
+    if slug in PLACES:
+        return PLACES[slug]
+    index = place_index()
+    hit = index[(index["NAME"].str.lower() == key.strip().lower())
+                | (index["GEOID"] == key.strip())]
+    if hit.empty:
+        raise KeyError(f"no place {key!r} in {PLACES_DBF}")
+    row = hit.iloc[0]
+    return _place(row["NAME"], row["GEOID"], row["NAMELSAD"])
+
+
+def is_built(place: Place) -> bool:
+    return all(Path(path).exists() for path in place.sources.values())
+
+
+def can_build() -> bool:
+    """True when the TIGER shapefiles needed by build_place are present."""
+    return all(Path(shp).exists() and Path(shp).with_suffix(".shx").exists()
+               for shp in (TRACTS_SHP, PLACES_SHP))
+
+
+def available_places() -> list:
+    """Slugs of the registry places whose data exist or can be built here."""
+    buildable = can_build()
+    return [slug for slug, place in PLACES.items() if is_built(place) or buildable]
+
+
+# ── lazy build ───────────────────────────────────────────────────────
+_build_lock = threading.Lock()
+
+
+def build_place(place: Place) -> list:
+    """Write the grid, tract and boundary files of one place from TIGER + ACS."""
+    import build_data
+
+    if not can_build():
+        raise FileNotFoundError(
+            f"building {place.name} needs the TIGER shapefiles {TRACTS_SHP} and "
+            f"{PLACES_SHP} (with .shx) next to their .dbf files")
+    tracts, places = build_data.read_tiger()
+    places = places[places["GEOID"] == place.geoid]
+    acs_csv = os.environ.get("LW_ACS_CSV")
+    acs = build_data.read_acs(acs_csv) if acs_csv else build_data.fetch_acs()
+
+    grid = build_data.build_grid(tracts, places, acs)
+    tract_rent = build_data.build_tracts(tracts, places, acs)
+    # the shipped tract file's columns; B25031 has no median bedroom count
+    tract_rent["monthly_rent"] = tract_rent["median_rent_all"]
+    tract_rent["median_bedrooms"] = np.nan
+    boundary = places.assign(NAMELSAD=place.namelsad)[["GEOID", "NAME", "NAMELSAD", "geometry"]]
+
+    # write into a temp dir and move, so readers never see half a place
+    PLACES_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=PLACES_DIR))
+    try:
+        written = build_data.write_outputs(grid, tract_rent, places, tmp)
+        written.append(tmp / Path(place.sources["city_boundary"]).name)
+        boundary.to_file(written[-1], driver="GeoJSON")
+        for path in written:
+            os.replace(path, PLACES_DIR / path.name)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return [PLACES_DIR / path.name for path in written]
+
+
+def ensure_built(place: Place) -> Place:
+    """Build the place's files on first request; returns the place."""
+    if not is_built(place):
+        with _build_lock:
+            if not is_built(place):
+                build_place(place)
+    return place
@@ -0,0 +1,126 @@
+# profiling.py  ───────────────────────────────────────────────────────
+# Opt-in per-rerun stage timing for the Streamlit apps.
+#
+# Enable with LW_PROFILE=1 in the environment or ?profile=1 in the URL.
+# Each rerun then times every named stage, records peak traced memory,
+# shows the numbers in a collapsible debug panel and appends one JSON
+# line per rerun to LW_PROFILE_LOG (default: profile_log.jsonl).
+# Disabled, `stage()` hands back a shared no-op context manager.
+import json
+import os
+import resource
+import threading
+import time
+import tracemalloc
+import uuid
+import weakref
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+LOG_PATH = os.environ.get("LW_PROFILE_LOG", "profile_log.jsonl")
+
+_NOOP = nullcontext()
+
+# tracemalloc is process-wide: it runs while any profiler is active and is
+# stopped by the last one to finish (or, if a rerun died before finishing,
+# by the next profiler created once no live one is left)
+_active = weakref.WeakSet()
+_tracing_lock = threading.Lock()
+_we_started = False
+
+
+def _acquire_tracing(profiler) -> None:
+    global _we_started
+    with _tracing_lock:
+        if not _active and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _we_started = True
+        _active.add(profiler)
+
+
+def _release_tracing(profiler=None) -> None:
+    global _we_started
+    with _tracing_lock:
+        if profiler is not None:
+            _active.discard(profiler)
+        if not _active and _we_started:
+            tracemalloc.stop()
+            _we_started = False
+
+
+def profiling_requested(query_params=None) -> bool:
+    """True when LW_PROFILE is set or the page URL carries ?profile=1."""
+    if os.environ.get("LW_PROFILE", "") not in ("", "0"):
+        return True
+    return bool(query_params) and query_params.get("profile") in ("1", "true")
+
+
+class RerunProfiler:
+    """Collects (stage, seconds, peak MiB) for one script rerun."""
+
+    def __init__(self, enabled: bool = False, script: str = "app"):
+        self.enabled = enabled
+        self.script = script
+        self.stages = []
+        self._finished = False
+        if enabled:
+            self._t0 = time.perf_counter()
+            _acquire_tracing(self)
+        elif _we_started and not _active:
+            _release_tracing()          # left on by a rerun that never finished
+
+    def stage(self, name: str):
+        return self._timed(name) if self.enabled else _NOOP
+
+    @contextmanager
+    def _timed(self, name: str):
+        tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            self.stages.append({"stage": name,
+                                "seconds": round(seconds, 6),
+                                "peak_mib": round(peak / 2**20, 3)})
+
+    def record(self) -> dict:
+        return {
+            "rerun_id": uuid.uuid4().hex[:12],
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "script": self.script,
+            "total_seconds": round(time.perf_counter() - self._t0, 6),
+            # ru_maxrss is KiB on Linux
+            "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "stages": self.stages,
+        }
+
+    def finish(self, panel: bool = True):
+        """
+        Append this rerun to the log and (optionally) draw the debug panel.
+        Call it from a `finally`, so interrupted reruns release tracing too.
+        """
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+        record = self.record()
+        _release_tracing(self)
+        try:
+            with open(LOG_PATH, "a") as fh:
+                fh.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+        if panel:
+            render_panel(record)
+        return record
+
+
+def render_panel(record: dict) -> None:
+    import pandas as pd
+    import streamlit as st
+
+    with st.expander(f"⏱️ Profiling — {record['total_seconds'] * 1e3:,.0f} ms rerun",
+                     expanded=False):
+        st.caption(f"max RSS {record['max_rss_mib']:,.1f} MiB · rerun {record['rerun_id']}")
+        st.dataframe(pd.DataFrame(record["stages"]).set_index("stage"))
@@ -1,13 +1,13 @@
 import streamlit as st
-import geopandas as gpd
 import pandas as pd
 import pydeck as pdk
+from datasets import read_dataset
 
 st.set_page_config(page_title="Fort Worth Tracts With Rent", layout="wide")
 st.title("🗺️ Fort Worth Census Tracts With Rent")
 
 # Load GeoJSON
-gdf = gpd.read_file("fort_worth_tracts_with_rent.geojson")
+gdf = read_dataset("tracts_rent", zoom=10)   # simplified for the map zoom
 
 st.subheader("Data Preview")
 st.dataframe(gdf.drop(columns='geometry').head())
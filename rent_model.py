@@ -0,0 +1,119 @@
+# rent_model.py  ──────────────────────────────────────────────────────
+# Housing-cost distributions fitted from the grid's ACS median rents
+# instead of hard-coded normals.  Every grid cell with an estimate counts
+# with its land area, so a large suburban cell weighs more than a sliver
+# on a tract edge.
+#
+# Per-cell (area, tract, rents) are extracted once per dataset version
+# into artifacts/ (the only step that needs geopandas); each CDF is then a
+# sorted value array with cumulative weights, so a quantile is one binary
+# search.  CDFs for a set of tracts are built on first request and kept
+# in the process-wide shared_cache.CACHE.
+# Each function takes an optional `place` (places.Place); None is the
+# shipped Fort Worth grid.
+from dataclasses import dataclass
+
+import numpy as np
+
+from datasets import bedroom_column, dataset_source, read_dataset, source_key
+from geometry import ARTIFACT_DIR, artifact_path, temp_sibling
+from shared_cache import CACHE
+
+EQUAL_AREA_CRS = 5070         # CONUS Albers, for cell areas in m²
+BEDROOM_SIZES = (0, 1, 2, 3, 4)   # 4 stands for "4 or more"
+
+
+@dataclass(frozen=True)
+class RentCDF:
+    """Area-weighted empirical distribution: sorted rents + cumulative weight."""
+    values: np.ndarray        # sorted rents
+    cum_weight: np.ndarray    # weight share up to the middle of each value, in (0, 1)
+    mean: float               # area-weighted
+    sd: float
+
+    @classmethod
+    def fit(cls, values, weights) -> "RentCDF":
+        values, weights = np.asarray(values, dtype=float), np.asarray(weights, dtype=float)
+        if not len(values):
+            raise ValueError("no rent estimates in this selection")
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        share = weights / weights.sum()
+        cum = np.cumsum(share) - share / 2
+        mean = float(np.dot(share, values))
+        sd = float(np.sqrt(np.dot(share, (values - mean) ** 2)))
+        for arr in (values, cum):
+            arr.flags.writeable = False
+        return cls(values, cum, mean, sd)
+
+    def quantile(self, q):
+        """Rent at weight share `q` (scalar or array), linear between cells."""
+        return np.interp(q, self.cum_weight, self.values)
+
+    def cdf(self, rent):
+        """Weight share of area with median rent ≤ `rent`."""
+        return np.interp(rent, self.values, self.cum_weight, left=0.0, right=1.0)
+
+
+def _columns(bedrooms: int) -> list:
+    """Rent columns pooled for a bedroom count; 4 and up pool 4 and 5+."""
+    if bedrooms >= 4:
+        return [bedroom_column(4), bedroom_column(5)]
+    return [bedroom_column(bedrooms)]
+
+
+# ── per-cell table ───────────────────────────────────────────────────
+def cell_table(place=None) -> dict:
+    """{"area", "tract", "county_tract", <rent column>…} arrays per grid cell."""
+    src = dataset_source("grid", place)
+    return CACHE.get_or_build(("rent_cells", *source_key("grid", place)),
+                              lambda: _load_cells(src, place))
+
+
+def _load_cells(src, place) -> dict:
+    path = ARTIFACT_DIR / (artifact_path(src).name + "-rents.npz")
+    if not path.exists():
+        gdf = read_dataset("grid", place=place)
+        columns = sorted({c for b in BEDROOM_SIZES for c in _columns(b)})
+        arrays = {"area": gdf.geometry.to_crs(EQUAL_AREA_CRS).area.to_numpy(),
+                  "tract": gdf["tract"].to_numpy().astype(str),
+                  "county_tract": (gdf["county"] + gdf["tract"]).to_numpy().astype(str),
+                  **{c: gdf[c].to_numpy(dtype=float) for c in columns}}
+        ARTIFACT_DIR.mkdir(exist_ok=True)
+        tmp = temp_sibling(path, ".npz")
+        np.savez(tmp, **arrays)
+        tmp.replace(path)
+    with np.load(path) as data:
+        return {k: data[k] for k in data.files}
+
+
+def rent_cdf(bedrooms: int, tracts: frozenset = None, place=None) -> RentCDF:
+    """
+    CDF for a bedroom count over the whole grid, or over the cells of
+    `tracts` (a frozenset of 6-digit tract or 9-digit county + tract
+    codes).  Sentinels are dropped.
+    """
+    key = ("rent_cdf", *source_key("grid", place), bedrooms, tracts)
+    return CACHE.get_or_build(key, lambda: _fit_cdf(bedrooms, tracts, place))
+
+
+def _fit_cdf(bedrooms: int, tracts, place) -> RentCDF:
+    cells = cell_table(place)
+    mask = None
+    if tracts is not None:
+        codes = list(tracts)
+        mask = np.isin(cells["tract"], codes) | np.isin(cells["county_tract"], codes)
+    values, weights = [], []
+    for column in _columns(bedrooms):
+        ok = cells[column] > 0
+        if mask is not None:
+            ok &= mask
+        values.append(cells[column][ok])
+        weights.append(cells["area"][ok])
+    return RentCDF.fit(np.concatenate(values), np.concatenate(weights))
+
+
+def housing_quantile(q, bedrooms: int, tracts=None, place=None):
+    """Area-weighted rent quantile for `bedrooms` (0 … 4+), optionally per tracts."""
+    tracts = None if tracts is None else frozenset(tracts)
+    return rent_cdf(min(int(bedrooms), 4), tracts, place).quantile(q)
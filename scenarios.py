@@ -0,0 +1,195 @@
+# scenarios.py  ───────────────────────────────────────────────────────
+# Policy what-ifs: a Scenario overrides tax parameters (taxes.TaxPolicy)
+# and cost-distribution means / SDs; `sweep` evaluates a grid of them
+# (over a process pool when the grid is large enough to pay for one) and
+# returns one tidy frame.
+#
+#   grid = scenario_grid(ctc_per_child=[2_000, 3_000],
+#                        std_ded_hoh=[22_500, 25_000],
+#                        transport_scale=[1.0, 1.15])
+#   df = sweep(grid, qs=[0.4, 0.5])
+#
+# Knobs: ctc_per_child, ctc_phaseout, ctc_threshold_<filing>,
+# std_ded_<filing>, brackets_<filing> (a whole schedule) and, for every
+# living_wage distribution the model reads, <name>_mean, <name>_sd or
+# <name>_scale (mean and sd × factor).  Health is not one of them: the
+# model prices it per family from city_health, so health_* knobs raise.
+#
+# Under a new (mean, sd) every quantile is mean + sd·z_q, with z_q taken
+# from living_wage's own draws standardised (housing: the fitted rent CDF
+# standardised by its mean and sd).  Workers attach to those draws in
+# shared memory (read-only) and evaluate scenarios in batches; the
+# baseline scenario reproduces the app's tables.
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from living_wage import (_HOUSING_ROW, COST_PARAMS, DISTRIBUTIONS, EARNERS,
+                         FAMILY_LABELS, _sorted_draws, cost_params,
+                         living_wage_cube, quantiles_of_sorted)
+from rent_model import rent_cdf
+from taxes import BRACKETS, CTC_THRESHOLD, DEFAULT_POLICY, STD_DED, TaxPolicy
+
+BATCH = 1_000
+# Scenarios sharing a tax policy are one vectorised living_wage_cube call
+# (~0.03 ms each); every distinct policy costs ~0.25 ms.  A pool costs
+# ~0.15 s to start plus ~0.05 ms per scenario shipped, so it only pays
+# off for many distinct policies and more than one CPU.
+POOL_MIN_POLICIES = 2_000
+# distributions living_wage_cube never reads (health comes from city_health)
+UNUSED_DISTRIBUTIONS = ("health",)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    policy: TaxPolicy = DEFAULT_POLICY
+    cost_params: Mapping = field(default_factory=cost_params)
+    knobs: tuple = ()      # (name, value) pairs it was built from
+
+    def key(self) -> tuple:
+        return self.policy.key(), tuple(sorted(self.cost_params.items()))
+
+    def __hash__(self):
+        return hash(self.key())
+
+    @classmethod
+    def from_knobs(cls, **knobs) -> "Scenario":
+        tax, std, thresholds = {}, dict(STD_DED), dict(CTC_THRESHOLD)
+        brackets, params = dict(BRACKETS), cost_params()
+        for name, value in knobs.items():
+            filing = name.rpartition("_")[2]
+            if name in ("ctc_per_child", "ctc_phaseout"):
+                tax[name] = value
+            elif name.startswith("std_ded_") and filing in std:
+                std[filing] = value
+            elif name.startswith("ctc_threshold_") and filing in thresholds:
+                thresholds[filing] = value
+            elif name.startswith("brackets_") and filing in brackets:
+                brackets[filing] = [tuple(b) for b in value]
+            else:
+                dist, _, what = name.rpartition("_")
+                if dist not in params or what not in ("mean", "sd", "scale"):
+                    raise ValueError(f"unknown scenario knob {name!r}")
+                if dist in UNUSED_DISTRIBUTIONS:
+                    raise ValueError(f"scenario knob {name!r} has no effect: the model "
+                                     f"takes {dist} costs from city_health, not a distribution")
+                mean, sd = params[dist]
+                params[dist] = {"mean": (value, sd), "sd": (mean, value),
+                                "scale": (mean * value, sd * value)}[what]
+        policy = TaxPolicy(std_ded=std, brackets=brackets, ctc_threshold=thresholds, **tax)
+        return cls(policy, params, tuple(knobs.items()))
+
+
+def scenario_grid(**axes) -> list:
+    """Every combination of the knob values in `axes` (knob → list)."""
+    names = list(axes)
+    return [Scenario.from_knobs(**dict(zip(names, combo)))
+            for combo in itertools.product(*axes.values())]
+
+
+def evaluate(scenarios, z: np.ndarray, qs, include_tax: bool = True):
+    """
+    (monthly net, annual gross), each (scenario × percentile × family).
+    Scenarios sharing a tax policy go through living_wage_cube together,
+    with (scenario, percentile) flattened onto its percentile axis.
+    """
+    qs = np.asarray(qs, dtype=float)
+    n_d, n_q = z.shape
+    net = np.empty((len(scenarios), n_q, len(FAMILY_LABELS)))
+    gross = np.empty_like(net)
+
+    groups = {}
+    for i, scenario in enumerate(scenarios):
+        groups.setdefault(scenario.policy, []).append(i)
+    for policy, idx in groups.items():
+        params = np.array([[scenarios[i].cost_params[d] for d in DISTRIBUTIONS] for i in idx])
+        quant = params[:, :, :1] + params[:, :, 1:] * z             # (k, dist, P)
+        quant = quant.transpose(1, 0, 2).reshape(n_d, len(idx) * n_q)
+        costs, annual_gross = living_wage_cube(np.tile(qs, len(idx)), include_tax,
+                                               quantiles=quant, policy=policy)
+        net[idx] = costs.sum(axis=-1).reshape(len(idx), n_q, -1)
+        gross[idx] = annual_gross.reshape(len(idx), n_q, -1)
+    return net, gross
+
+
+# ── shared standardised draws ────────────────────────────────────────
+def standard_draws() -> np.ndarray:
+    """living_wage's sorted draws mapped to N(0, 1), one row per distribution."""
+    mean, sd = (np.array(col, dtype=float) for col in zip(*COST_PARAMS.values()))
+    return (_sorted_draws() - mean[:, None]) / sd[:, None]
+
+
+def standard_quantiles(draws: np.ndarray, qs) -> np.ndarray:
+    """z_q per distribution; housing rows from the standardised rent CDFs."""
+    z = quantiles_of_sorted(draws, qs)
+    for bedrooms, row in _HOUSING_ROW.items():
+        cdf = rent_cdf(bedrooms)
+        z[row] = (cdf.quantile(qs) - cdf.mean) / cdf.sd
+    return z
+
+
+_worker = {}
+
+
+def _attach(shm_name: str, shape: tuple) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    draws = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    draws.flags.writeable = False
+    _worker.update(shm=shm, draws=draws)     # keep the mapping alive
+
+
+def _run_batch(task):
+    scenarios, qs, include_tax = task
+    return evaluate(scenarios, standard_quantiles(_worker["draws"], qs), qs, include_tax)
+
+
+def sweep(scenarios, qs=(0.5,), workers: int = None, batch: int = BATCH,
+          include_tax: bool = True) -> pd.DataFrame:
+    """
+    Evaluate every scenario at every percentile in `qs`.  One row per
+    (scenario, percentile, family type), with the scenario's knobs as
+    columns.  Runs in-process unless there are at least POOL_MIN_POLICIES
+    distinct tax policies and more than one worker; `workers=1` forces
+    in-process.
+    """
+    scenarios = list(scenarios)
+    qs = np.asarray(qs, dtype=float)
+    draws = standard_draws()
+    batches = [(scenarios[i:i + batch], qs, include_tax)
+               for i in range(0, len(scenarios), batch)]
+
+    pool_workers = workers or os.cpu_count() or 1
+    if (pool_workers < 2 or len(batches) <= 1
+            or len({s.policy for s in scenarios}) < POOL_MIN_POLICIES):
+        _worker["draws"] = draws
+        parts = [_run_batch(task) for task in batches]
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=draws.nbytes)
+        try:
+            np.ndarray(draws.shape, dtype=draws.dtype, buffer=shm.buf)[:] = draws
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                     initargs=(shm.name, draws.shape)) as pool:
+                parts = list(pool.map(_run_batch, batches))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    net = np.concatenate([p[0] for p in parts])          # (S, P, F)
+    gross = np.concatenate([p[1] for p in parts])
+    n_s, n_q, n_f = net.shape
+    knobs = pd.DataFrame([dict(s.knobs) for s in scenarios], index=range(n_s))
+    frame = pd.DataFrame({
+        "scenario": np.repeat(np.arange(n_s), n_q * n_f),
+        "percentile": np.tile(np.repeat(qs, n_f), n_s),
+        "Family Type": np.tile(np.array(FAMILY_LABELS), n_s * n_q),
+        "Monthly Net ($)": net.ravel().round(2),
+        "Annual Gross ($)": gross.ravel().round(2),
+        "Living Wage ($/hr)": (gross / (2080 * EARNERS)).ravel().round(2),
+    })
+    return knobs.reindex(frame["scenario"]).reset_index(drop=True).join(frame)
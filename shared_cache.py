@@ -0,0 +1,151 @@
+# shared_cache.py  ────────────────────────────────────────────────────
+# Process-wide cache for loaded datasets, shared by every Streamlit
+# session in the server process (module globals outlive sessions) and
+# bounded by memory rather than entry count: values are sized when they
+# are stored and the least recently used ones are evicted once the total
+# passes LW_CACHE_MB (default 512 MiB).
+#
+#   layers = CACHE.get_or_build(("grid_layers", place.slug, 10),
+#                               lambda: bedroom_layers("grid", 10, place))
+#
+# Concurrent requests for a missing key build it once; the others wait
+# for that build instead of repeating it.
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+
+import numpy as np
+
+MAX_BYTES = int(float(os.environ.get("LW_CACHE_MB", "512")) * 2**20)
+_SAMPLE = 32              # container items measured before extrapolating
+
+
+def _sampled(items, measure, depth: int) -> int:
+    """Sum of `measure(item)` over `items`, extrapolated from an even sample."""
+    step = max(1, len(items) // _SAMPLE)
+    sample = items[::step]
+    inner = sum(measure(v, depth) for v in sample)
+    return inner * len(items) // len(sample) if sample else 0
+
+
+def _beyond_shallow(obj, depth: int) -> int:
+    return sizeof(obj, depth) - sys.getsizeof(obj)
+
+
+def sizeof(obj, _depth: int = 0) -> int:
+    """
+    Estimated bytes held by `obj`: exact for arrays, sampled for large
+    containers and object columns.  Plain objects are measured through
+    their attributes; objects may report their own `nbytes`.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if hasattr(obj, "memory_usage"):                 # DataFrame / Series
+        usage = obj.memory_usage(deep=True)
+        size = int(getattr(usage, "sum", lambda: usage)())
+        # deep usage counts object cells with sys.getsizeof only; add what
+        # nested values (coordinate lists, arrays …) hold beyond that
+        columns = obj.items() if hasattr(obj, "columns") else [(None, obj)]
+        for _, column in columns:
+            if column.dtype == object:
+                size += _sampled(column.tolist(), _beyond_shallow, _depth + 1)
+        return size
+    if isinstance(getattr(obj, "nbytes", None), (int, np.integer)):
+        return int(obj.nbytes)
+    if _depth > 8:
+        return sys.getsizeof(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return sys.getsizeof(obj) + sum(sizeof(getattr(obj, f.name), _depth + 1)
+                                        for f in fields(obj))
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + _sampled(
+            list(obj.items()), lambda kv, d: sizeof(kv[0], d) + sizeof(kv[1], d), _depth + 1)
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        items = obj if isinstance(obj, (list, tuple)) else list(obj)
+        return sys.getsizeof(obj) + _sampled(items, sizeof, _depth + 1)
+    if hasattr(obj, "__dict__") and not isinstance(obj, type):
+        return sys.getsizeof(obj) + sizeof(vars(obj), _depth + 1)
+    return sys.getsizeof(obj)
+
+
+class SharedCache:
+    """Thread-safe LRU mapping bounded by the estimated size of its values."""
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()            # key → (value, bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._building = {}                   # key → lock held by the builder
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key][0]
+
+    def put(self, key, value, size: int = None) -> None:
+        """Store `value` (sized with `sizeof` unless given), then evict to fit."""
+        size = sizeof(value) if size is None else int(size)
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            # the newest entry stays even when it alone exceeds the budget
+            while self._bytes > self.max_bytes and len(self._data) > 1:
+                _, (_, freed) = self._data.popitem(last=False)
+                self._bytes -= freed
+                self.evictions += 1
+
+    def get_or_build(self, key, build):
+        """Cached value for `key`, calling `build()` once if it is missing."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        with self._lock:
+            lock = self._building.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                value = self.get(key, missing)      # built while we waited
+                if value is missing:
+                    with self._lock:
+                        self.misses += 1
+                    value = build()
+                    self.put(key, value)
+        finally:                                    # also when build() raises
+            with self._lock:
+                self._building.pop(key, None)
+        return value
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def discard(self, key) -> None:
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._data), "bytes": self._bytes,
+                    "max_bytes": self.max_bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+CACHE = SharedCache()
@@ -0,0 +1,84 @@
+# stages.py  ──────────────────────────────────────────────────────────
+# Dependency-aware recomputation for the Streamlit app.
+#
+# Each stage declares the inputs (widget values) or earlier stages it
+# reads.  On every rerun the graph compares the new inputs with the
+# previous ones and only runs stages downstream of something that
+# changed; the rest are served from the previous result, kept in a
+# per-session state dict (st.session_state in the app).
+#
+#   graph = StageGraph()
+#
+#   @graph.stage("bedroom_col")
+#   def cells(bedroom_col): ...
+#
+#   @graph.stage("cells", "housing")
+#   def colors(cells, housing): ...
+#
+#   results = graph.run(st.session_state.setdefault("stages", {}),
+#                       {"bedroom_col": ..., "housing": ...})
+from contextlib import nullcontext
+
+_MISSING = object()
+
+
+def _same(a, b) -> bool:
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):       # arrays, frames: compare identity
+        return a is b
+
+
+class StageGraph:
+    """Named stages in declaration order; dependencies must come first."""
+
+    def __init__(self):
+        self._stages = {}                 # name → (fn, deps)
+
+    def stage(self, *deps, name: str = None):
+        def register(fn):
+            key = name or fn.__name__
+            if key in self._stages:
+                raise ValueError(f"stage {key!r} is already defined")
+            self._stages[key] = (fn, deps)
+            return fn
+        return register
+
+    @property
+    def names(self) -> list:
+        return list(self._stages)
+
+    def run(self, state: dict, inputs: dict, profiler=None) -> dict:
+        """
+        Evaluate the graph against `inputs`, reusing `state` from the last
+        run.  Returns {name: value} for every input and stage; the names
+        of stages actually recomputed are in state["recomputed"].
+        """
+        values = state.setdefault("values", {})
+        versions = state.setdefault("versions", {})
+        seen = state.setdefault("seen", {})
+
+        for key, value in inputs.items():
+            if key in self._stages:
+                raise ValueError(f"{key!r} is both an input and a stage")
+            old = values.get(key, _MISSING)
+            if old is _MISSING or not _same(old, value):
+                values[key] = value
+                versions[key] = versions.get(key, 0) + 1
+
+        recomputed = []
+        for key, (fn, deps) in self._stages.items():
+            missing = [d for d in deps if d not in versions]
+            if missing:
+                raise KeyError(f"stage {key!r} needs undefined {missing}")
+            stamp = tuple(versions[d] for d in deps)
+            if seen.get(key) == stamp:
+                continue
+            with profiler.stage(key) if profiler else nullcontext():
+                values[key] = fn(*(values[d] for d in deps))
+            versions[key] = versions.get(key, 0) + 1
+            seen[key] = stamp
+            recomputed.append(key)
+
+        state["recomputed"] = recomputed
+        return values
@@ -66,7 +66,12 @@
 # ────────────────────────────────────────────────────────────────────
 # taxes.py   (2025 rules + children‑aware gross‑up helper)
 # ────────────────────────────────────────────────────────────────────
-from typing import Literal, Tuple
+import warnings
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Literal, Mapping, Tuple
+
+import numpy as np
 
 # 2025 standard deductions
 STD_DED = {
@@ -97,11 +102,40 @@ BRACKETS = {
 SS_WAGE_BASE = 176_100
 OASDI, MEDIC = 0.062, 0.0145  # FICA rates
 
+CTC_PER_CHILD = 2_000
+CTC_PHASEOUT = 0.05           # credit lost per $ of AGI over the threshold
+CTC_THRESHOLD = {"single": 200_000, "married": 400_000, "hoh": 200_000}
+
+
+@dataclass(frozen=True)
+class TaxPolicy:
+    """
+    The federal parameters a scenario may change.  Defaults are the 2025
+    constants above; hashable, so the inversion tables cache per policy.
+    """
+    std_ded: Mapping = field(default_factory=lambda: STD_DED)
+    brackets: Mapping = field(default_factory=lambda: BRACKETS)
+    ctc_per_child: float = CTC_PER_CHILD
+    ctc_phaseout: float = CTC_PHASEOUT
+    ctc_threshold: Mapping = field(default_factory=lambda: CTC_THRESHOLD)
+
+    def key(self) -> tuple:
+        return (tuple(sorted(self.std_ded.items())),
+                tuple((f, tuple(map(tuple, s))) for f, s in sorted(self.brackets.items())),
+                self.ctc_per_child, self.ctc_phaseout,
+                tuple(sorted(self.ctc_threshold.items())))
+
+    def __hash__(self):
+        return hash(self.key())
+
+
+DEFAULT_POLICY = TaxPolicy()
+
 
 # ── helpers ─────────────────────────────────────────────────────────
 def _income_tax_liability(taxable: float, schedule) -> float:
     tax = 0.0
-    for (lo, rate), (hi, _) in zip(schedule, schedule[1:] + [(float("inf"), 0)]):
+    for (lo, rate), (hi, _) in zip(schedule, list(schedule[1:]) + [(float("inf"), 0)]):
         if taxable > lo:
             tax += (min(taxable, hi) - lo) * rate
         else:
@@ -109,14 +143,15 @@ def _income_tax_liability(taxable: float, schedule) -> float:
     return tax
 
 
-def child_tax_credit(agi: float, n_children: int, filing: str) -> float:
+def child_tax_credit(agi: float, n_children: int, filing: str,
+                     policy: TaxPolicy = DEFAULT_POLICY) -> float:
     """
     Simple 2025 CTC:
     $2 000 per child, phase‑out 5 ¢ per $ over threshold.
     """
-    base = 2_000 * n_children
-    threshold = 400_000 if filing == "married" else 200_000
-    reduction = max(0.0, 0.05 * (agi - threshold))
+    base = policy.ctc_per_child * n_children
+    threshold = policy.ctc_threshold[filing]
+    reduction = max(0.0, policy.ctc_phaseout * (agi - threshold))
     return max(0.0, base - reduction)
 
 
@@ -132,30 +167,83 @@ def payroll_tax(gross: float, earners: int = 1) -> float:
 def net_after_tax(gross: float,
                   filing: str,
                   children: int,
-                  earners: int) -> float:
-    taxable = max(0.0, gross - STD_DED[filing])
-    liability = _income_tax_liability(taxable, BRACKETS[filing])
-    liability -= child_tax_credit(gross, children, filing)
+                  earners: int,
+                  policy: TaxPolicy = DEFAULT_POLICY) -> float:
+    taxable = max(0.0, gross - policy.std_ded[filing])
+    liability = _income_tax_liability(taxable, policy.brackets[filing])
+    liability -= child_tax_credit(gross, children, filing, policy)
     fica = payroll_tax(gross, earners)
     return gross - liability - fica
 
 
+# ── piecewise‑linear inversion ──────────────────────────────────────
+# net_after_tax is piecewise linear and strictly increasing in gross
+# (top marginal rate + CTC phase‑out + FICA < 100 %), so it can be
+# inverted exactly from its values at the kinks.
+_TAIL = 1_000_000.0   # extra point past the last kink → slope of the tail
+
+@lru_cache(maxsize=8192)
+def breakpoint_table(filing: str,
+                     children: int = 0,
+                     earners: int = 1,
+                     policy: TaxPolicy = DEFAULT_POLICY) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return ``(gross, net)`` at every kink of net_after_tax for one
+    (filing, children, earners) combination, sorted by gross.
+    """
+    std = policy.std_ded[filing]
+    threshold = policy.ctc_threshold[filing]
+    kinks = {0.0, std, threshold, SS_WAGE_BASE * earners}
+    kinks.update(std + lo for lo, _ in policy.brackets[filing])
+    if children and policy.ctc_phaseout > 0:             # CTC fully phased out
+        kinks.add(threshold + policy.ctc_per_child * children / policy.ctc_phaseout)
+
+    gross = np.array(sorted(kinks), dtype=float)
+    gross = np.append(gross, gross[-1] + _TAIL)
+    net = np.array([net_after_tax(g, filing, children, earners, policy) for g in gross])
+    for arr in (gross, net):
+        arr.flags.writeable = False
+    return gross, net
+
+
+def gross_from_net_array(target_net,
+                         filing: Literal["single", "married", "hoh"],
+                         children: int = 0,
+                         earners: int = 1,
+                         policy: TaxPolicy = DEFAULT_POLICY) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised gross_from_net: invert a whole array of annual nets with one
+    binary search and one linear solve per element.
+    """
+    target = np.asarray(target_net, dtype=float)
+    gross_k, net_k = breakpoint_table(filing, children, earners, policy)
+
+    seg = np.clip(np.searchsorted(net_k, target, side="right") - 1,
+                  0, len(net_k) - 2)
+    slope = (net_k[seg + 1] - net_k[seg]) / (gross_k[seg + 1] - gross_k[seg])
+    gross = gross_k[seg] + (target - net_k[seg]) / slope
+
+    # keep the old bisection bracket [net, 2.5 × net]
+    gross = np.clip(gross, target, target * 2.5)
+    eff_rate = 1 - target / gross
+    return gross, eff_rate
+
+
 # ── public helper ───────────────────────────────────────────────────
 def gross_from_net(target_net: float,
                    filing: Literal["single", "married", "hoh"],
                    children: int = 0,
                    earners: int = 1,
-                   tol: float = 0.01) -> Tuple[float, float]:
+                   tol: float = None,
+                   policy: TaxPolicy = DEFAULT_POLICY) -> Tuple[float, float]:
     """
     Return (gross_income_needed, effective_tax_rate) that yields `target_net`
     after 2025 federal income tax, FICA, and the child tax credit.
+
+    `tol` is deprecated and ignored: the breakpoint-table inversion is exact.
     """
-    lo, hi = target_net, target_net * 2.5
-    for _ in range(80):                # bisection to <1 ¢
-        mid = (lo + hi) / 2
-        if net_after_tax(mid, filing, children, earners) < target_net:
-            lo = mid
-        else:
-            hi = mid
-    eff_rate = 1 - target_net / hi
-    return hi, eff_rate
+    if tol is not None:
+        warnings.warn("gross_from_net(tol=...) is ignored and will be removed; "
+                      "the inversion is exact", DeprecationWarning, stacklevel=2)
+    gross, eff_rate = gross_from_net_array(target_net, filing, children, earners, policy)
+    return float(gross), float(eff_rate)
@@ -0,0 +1,377 @@
+# tiles.py  ───────────────────────────────────────────────────────────
+# Mapbox Vector Tiles for the grid, tract and boundary datasets, cut per
+# zoom level into an MBTiles (SQLite) cache and served over a small local
+# HTTP endpoint that a pydeck MVTLayer reads from.
+#
+#   python tiles.py                 # build every tileset (zooms 8–14)
+#   python tiles.py --serve         # … and serve them on TILE_PORT
+#
+# A tile carries the dataset's attribute columns (e.g. every
+# median_rent_* value of the grid), so the map colors cells in the
+# browser from the budget (colors.affordability_expression) and a budget
+# or bedroom change never resends geometry.  Each zoom is cut from the
+# level of detail datasets.read_dataset builds for it.  Tilesets are
+# keyed by dataset version like every other artifact; the tile blobs are
+# gzip-compressed as the MBTiles spec asks and served that way.  Other
+# places (places.Place) get their own tilesets under /<place slug>/…;
+# only registry places whose data are already built are served.
+#
+# The encoder writes the MVT 2.1 protobuf directly (polygons only), so
+# no protobuf / mapbox-vector-tile dependency is needed.
+import argparse
+import gzip
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+from datasets import RENT_COLUMNS, dataset_source
+from geometry import ARTIFACT_DIR, artifact_path, temp_sibling
+
+# tileset → (dataset, attribute columns carried in the tiles)
+TILESETS = {
+    "grid":     ("grid", ["tract"] + RENT_COLUMNS),
+    "tracts":   ("tracts", ["tract", "county", "monthly_rent", "median_bedrooms"]),
+    "boundary": ("city_boundary", ["NAME"]),
+}
+MIN_ZOOM, MAX_ZOOM = 8, 14
+EXTENT = 4096                 # tile coordinate range
+BUFFER = 64                   # clip margin in tile units, hides seams
+ORIGIN = 20037508.342789244   # half the Web Mercator world width, metres
+
+TILE_HOST = os.environ.get("LW_TILE_HOST", "127.0.0.1")
+TILE_PORT = int(os.environ.get("LW_TILE_PORT", "8765"))
+# what the browser requests; override when the server sits behind a proxy
+TILE_URL = os.environ.get("LW_TILE_URL", f"http://{TILE_HOST}:{TILE_PORT}")
+
+
+def tiles_requested(query_params=None) -> bool:
+    """True when LW_TILES is set or the page URL carries ?tiles=1."""
+    if os.environ.get("LW_TILES", "") not in ("", "0"):
+        return True
+    return bool(query_params) and query_params.get("tiles") in ("1", "true")
+
+
+def tile_url(tileset: str, place=None) -> str:
+    """{z}/{x}/{y} URL template of a tileset, as MVTLayer expects it."""
+    prefix = "" if place is None else f"/{place.slug}"
+    return f"{TILE_URL}{prefix}/{tileset}/{{z}}/{{x}}/{{y}}.pbf"
+
+
+def mbtiles_path(tileset: str, place=None) -> Path:
+    src = dataset_source(TILESETS[tileset][0], place)
+    return ARTIFACT_DIR / f"{artifact_path(src).name}-{tileset}.mbtiles"
+
+
+# ── protobuf ─────────────────────────────────────────────────────────
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _field(number: int, payload: bytes) -> bytes:
+    """Length-delimited field."""
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _packed(number: int, values) -> bytes:
+    return _field(number, b"".join(_varint(int(v)) for v in values))
+
+
+def _value(value) -> bytes:
+    """Layer.Value message: string, sint or double."""
+    if isinstance(value, str):
+        return _field(1, value.encode())
+    if float(value).is_integer() and abs(value) < 2 ** 53:
+        v = int(value)
+        return _varint(6 << 3) + _varint((v << 1) ^ (v >> 63))
+    return _varint(3 << 3 | 1) + np.float64(value).astype("<f8").tobytes()
+
+
+def _zigzag(d: np.ndarray) -> np.ndarray:
+    return (d << 1) ^ (d >> 63)
+
+
+def _ring_area(pts: np.ndarray) -> float:
+    x, y = pts[:, 0], pts[:, 1]
+    return float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2
+
+
+def polygon_commands(rings, exterior) -> list:
+    """
+    Geometry command stream for one feature: `rings` are (n, 2) int64
+    tile-coordinate arrays (closed or not), `exterior` flags the first ring
+    of each polygon part.  Exteriors are wound to positive area in tile
+    coordinates (y down), holes to negative; rings that collapse at this
+    resolution are dropped, with the holes of a dropped exterior.
+    """
+    cmds, cursor, keep_holes = [], np.zeros(2, dtype=np.int64), False
+    for pts, outer in zip(rings, exterior):
+        if len(pts) > 1 and (pts[0] == pts[-1]).all():
+            pts = pts[:-1]
+        if len(pts):
+            pts = pts[np.r_[True, (np.diff(pts, axis=0) != 0).any(axis=1)]]
+        area = _ring_area(pts) if len(pts) >= 3 else 0.0
+        if outer:
+            keep_holes = area != 0
+        if area == 0 or not keep_holes:
+            continue
+        if (area > 0) != outer:
+            pts = pts[::-1]
+        deltas = _zigzag(np.diff(np.vstack([cursor, pts]), axis=0))
+        cursor = pts[-1]
+        cmds += [9, *deltas[0], (len(pts) - 1) << 3 | 2, *deltas[1:].ravel(), 15]
+    return cmds
+
+
+def encode_layer(name: str, features, extent: int = EXTENT) -> bytes:
+    """
+    One MVT layer from (id, properties, command stream) polygon features;
+    keys and values are shared through the layer's tables.
+    """
+    keys, values, body = {}, {}, []
+    for fid, props, cmds in features:
+        tags = []
+        for key, value in props.items():
+            tags += [keys.setdefault(key, len(keys)),
+                     values.setdefault((type(value).__name__, value), len(values))]
+        body.append(_field(2, _varint(1 << 3) + _varint(fid)
+                           + _packed(2, tags)
+                           + _varint(3 << 3) + _varint(3)          # POLYGON
+                           + _packed(4, cmds)))
+    return (_varint(15 << 3) + _varint(2)                         # version
+            + _field(1, name.encode())
+            + b"".join(body)
+            + b"".join(_field(3, k.encode()) for k in keys)
+            + b"".join(_field(4, _value(v)) for _, v in values)
+            + _varint(5 << 3) + _varint(extent))
+
+
+def encode_tile(layers: dict) -> bytes:
+    """Tile message from {layer name: encoded layer}."""
+    return b"".join(_field(3, layer) for layer in layers.values())
+
+
+# ── cutting ──────────────────────────────────────────────────────────
+def tile_bounds(z: int, x: int, y: int) -> tuple:
+    """(minx, miny, maxx, maxy) of an XYZ tile in Web Mercator metres."""
+    size = 2 * ORIGIN / 2 ** z
+    return (-ORIGIN + x * size, ORIGIN - (y + 1) * size,
+            -ORIGIN + (x + 1) * size, ORIGIN - y * size)
+
+
+def tile_range(bounds, z: int):
+    """XYZ tiles at zoom `z` covering Web Mercator `bounds`."""
+    size = 2 * ORIGIN / 2 ** z
+    minx, miny, maxx, maxy = bounds
+    x0, x1 = (int(math.floor((v + ORIGIN) / size)) for v in (minx, maxx))
+    y0, y1 = (int(math.floor((ORIGIN - v) / size)) for v in (maxy, miny))
+    return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+
+def _properties(frame, columns) -> list:
+    """Per-row {column: value}, without missing values."""
+    records = frame[columns].to_dict("records")
+    return [{k: v for k, v in row.items()
+             if v is not None and not (isinstance(v, float) and math.isnan(v))}
+            for row in records]
+
+
+def cut_zoom(tileset: str, z: int, place=None):
+    """Yield (x, y, encoded tile) for every non-empty tile of one zoom."""
+    import shapely
+
+    from datasets import read_dataset
+
+    name, columns = TILESETS[tileset]
+    gdf = read_dataset(name, zoom=z, place=place).to_crs(3857)
+    geoms = np.asarray(gdf.geometry.values)
+    props = _properties(gdf, columns)
+    tree = shapely.STRtree(geoms)
+
+    for x, y in tile_range(shapely.total_bounds(geoms), z):
+        minx, miny, maxx, maxy = tile_bounds(z, x, y)
+        scale = EXTENT / (maxx - minx)
+        pad = BUFFER / scale
+        idx = tree.query(shapely.box(minx - pad, miny - pad, maxx + pad, maxy + pad))
+        if not len(idx):
+            continue
+        idx.sort()
+        clipped = shapely.clip_by_rect(geoms[idx], minx - pad, miny - pad,
+                                       maxx + pad, maxy + pad)
+        parts, part_owner = shapely.get_parts(clipped, return_index=True)
+        polygonal = shapely.get_type_id(parts) == 3
+        parts, part_owner = parts[polygonal], part_owner[polygonal]
+        rings, ring_owner = shapely.get_rings(parts, return_index=True)
+        coords, vertex_owner = shapely.get_coordinates(rings, return_index=True)
+        tile_xy = np.rint((coords - [minx, maxy]) * [scale, -scale]).astype(np.int64)
+
+        ring_splits = np.searchsorted(vertex_owner, np.arange(1, len(rings)))
+        ring_xy = np.split(tile_xy, ring_splits)
+        exterior = np.r_[len(ring_owner) > 0, ring_owner[1:] != ring_owner[:-1]]
+        feature_of_ring = part_owner[ring_owner]
+
+        features = []
+        bounds = np.searchsorted(feature_of_ring, np.arange(len(idx) + 1))
+        for k, i in enumerate(idx):
+            a, b = bounds[k], bounds[k + 1]
+            cmds = polygon_commands(ring_xy[a:b], exterior[a:b])
+            if cmds:
+                features.append((int(i) + 1, props[i], cmds))
+        if features:
+            yield x, y, encode_tile({tileset: encode_layer(tileset, features)})
+
+
+# ── MBTiles cache ────────────────────────────────────────────────────
+_SCHEMA = """
+CREATE TABLE metadata (name TEXT, value TEXT);
+CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER,
+                    tile_row INTEGER, tile_data BLOB);
+CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row);
+"""
+
+
+def build_tileset(tileset: str, zooms=range(MIN_ZOOM, MAX_ZOOM + 1),
+                  place=None) -> Path:
+    """Cut every zoom of a tileset into its MBTiles file (rows are TMS)."""
+    out = mbtiles_path(tileset, place)
+    ARTIFACT_DIR.mkdir(exist_ok=True)
+    tmp = temp_sibling(out)
+    con = sqlite3.connect(tmp)
+    try:
+        con.executescript(_SCHEMA)
+        for z in zooms:
+            con.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)",
+                            ((z, x, 2 ** z - 1 - y, gzip.compress(data, mtime=0))
+                             for x, y, data in cut_zoom(tileset, z, place)))
+        name, columns = TILESETS[tileset]
+        layer = {"id": tileset, "minzoom": min(zooms), "maxzoom": max(zooms),
+                 "fields": {c: "String" if c in ("tract", "county", "NAME") else "Number"
+                            for c in columns}}
+        con.executemany("INSERT INTO metadata VALUES (?, ?)", [
+            ("name", tileset), ("format", "pbf"), ("type", "overlay"),
+            ("minzoom", str(min(zooms))), ("maxzoom", str(max(zooms))),
+            ("json", json.dumps({"vector_layers": [layer]})),
+        ])
+        con.commit()
+    finally:
+        con.close()
+    tmp.replace(out)
+    return out
+
+
+_build_lock = threading.Lock()
+
+
+def ensure_tileset(tileset: str, place=None) -> Path:
+    """The MBTiles file for the current dataset version, built on first use."""
+    path = mbtiles_path(tileset, place)
+    if not path.exists():
+        with _build_lock:
+            if not path.exists():
+                build_tileset(tileset, place=place)
+    return path
+
+
+_local = threading.local()
+
+
+def read_tile(tileset: str, z: int, x: int, y: int, place=None):
+    """Gzipped tile blob from the cache, or None for an empty tile."""
+    path = ensure_tileset(tileset, place)
+    cons = _local.__dict__.setdefault("cons", {})
+    con = cons.get(path)
+    if con is None:
+        con = cons[path] = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    row = con.execute("SELECT tile_data FROM tiles WHERE zoom_level = ? AND "
+                      "tile_column = ? AND tile_row = ?", (z, x, 2 ** z - 1 - y)).fetchone()
+    return row[0] if row else None
+
+
+# ── local endpoint ───────────────────────────────────────────────────
+_TILE_PATH = re.compile(r"^(?:/([\w-]+))?/(\w+)/(\d+)/(\d+)/(\d+)\.pbf$")
+
+
+def _place(slug):
+    """Registry place whose data are already built; KeyError otherwise."""
+    if slug is None:
+        return None
+    from places import PLACES, is_built
+
+    # never build on behalf of an HTTP request: any GET could start one
+    if slug not in PLACES or not is_built(PLACES[slug]):
+        raise KeyError(slug)
+    return PLACES[slug]
+
+
+class TileHandler(BaseHTTPRequestHandler):
+    """GET [/<place>]/<tileset>/<z>/<x>/<y>.pbf; empty tiles are 204."""
+
+    def do_GET(self):
+        match = _TILE_PATH.match(self.path.split("?")[0])
+        if not match or match[2] not in TILESETS:
+            self.send_error(404)
+            return
+        try:
+            place = _place(match[1])
+        except (KeyError, OSError):
+            self.send_error(404)
+            return
+        z, x, y = (int(v) for v in match.groups()[2:])
+        data = read_tile(match[2], z, x, y, place)
+        self.send_response(200 if data else 204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Cache-Control", "public, max-age=86400")
+        if data:
+            self.send_header("Content-Type", "application/vnd.mapbox-vector-tile")
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data or b"")))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def log_message(self, format, *args):      # keep the app's log quiet
+        pass
+
+
+def serve(host: str = TILE_HOST, port: int = TILE_PORT) -> ThreadingHTTPServer:
+    """Start the tile endpoint on a daemon thread (tilesets built first)."""
+    for tileset in TILESETS:
+        ensure_tileset(tileset)
+    server = ThreadingHTTPServer((host, port), TileHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True,
+                     name="tile-server").start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and serve the vector tile cache.")
+    parser.add_argument("--serve", action="store_true", help="serve after building")
+    parser.add_argument("--host", default=TILE_HOST)
+    parser.add_argument("--port", type=int, default=TILE_PORT)
+    args = parser.parse_args(argv)
+
+    for tileset in TILESETS:
+        print(build_tileset(tileset))
+    if args.serve:
+        server = serve(args.host, args.port)
+        print(f"serving {', '.join(TILESETS)} on http://{args.host}:{args.port}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# wage_cache.py  ──────────────────────────────────────────────────────
+# Process-wide, percentile-keyed cache of living-wage tables.  Module
+# globals are shared by every Streamlit session in the server process,
+# so a warm cache turns the percentile slider into a dictionary lookup.
+# Keys carry the grid's dataset_version, as cube.py's _meta.json does.
+# Tables are kept per place (places.Place; None is the shipped model).
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from breakdown import breakdown_from_cube
+from datasets import dataset_source
+from geometry import dataset_version
+from living_wage import MODEL_VERSION, living_wage_cube, table_from_cube
+
+PERCENTILE_STEP = 0.01
+SLIDER_PERCENTILES = np.round(np.arange(10, 91) * PERCENTILE_STEP, 2)  # 0.10 … 0.90
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping with a fixed number of entries."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_tables = LRUCache(maxsize=256)
+
+
+def percentile_key(q: float, place=None) -> tuple:
+    """
+    (model version, place, grid version, q snapped to the slider step) —
+    the cache key.  Housing quantiles come from the place's grid rents, so
+    a rebuilt grid gets fresh tables.
+    """
+    return (MODEL_VERSION, place, dataset_version(dataset_source("grid", place)),
+            round(round(q / PERCENTILE_STEP) * PERCENTILE_STEP, 2))
+
+
+def prewarm(qs=SLIDER_PERCENTILES, place=None) -> None:
+    """Fill the cache for every percentile in `qs` with one engine pass."""
+    keys = [percentile_key(q, place) for q in qs]
+    missing = sorted({k[-1] for k in keys if k not in _tables})
+    if not missing:
+        return
+    quantiles = None if place is None else place.cost_quantiles(missing)
+    costs, annual_gross = living_wage_cube(missing, quantiles=quantiles)
+    for i, q in enumerate(missing):
+        _tables.put(percentile_key(q, place),
+                    (breakdown_from_cube(costs[i], annual_gross[i]),
+                     table_from_cube(costs[i], annual_gross[i])))
+
+
+def _tables_for(q: float, place=None):
+    key = percentile_key(q, place)
+    tables = _tables.get(key)
+    if tables is None:
+        prewarm([q], place)
+        tables = _tables.get(key)
+    return tables
+
+
+def cached_breakdown(q: float, place=None) -> pd.DataFrame:
+    """living_wage_breakdown(q) from the cache (a copy — safe to mutate)."""
+    return _tables_for(q, place)[0].copy()
+
+
+def cached_table(q: float, place=None) -> pd.DataFrame:
+    """living_wage_table(q) from the cache (a copy — safe to mutate)."""
+    return _tables_for(q, place)[1].copy()
@@ -0,0 +1,284 @@
+# warmup.py  ──────────────────────────────────────────────────────────
+# Background warm-up of the app's caches, so the first visitor after a
+# deploy does not pay for the GeoJSON parse, reprojection, polygon
+# packing and the living-wage tables.  Per place, on-disk artifacts are
+# built first (GeoParquet copy, packed polygons, boundary payload, rent
+# table, vector tiles), then the in-memory data every session reads is
+# loaded into shared_cache / wage_cache / zonal: the grid layers with all
+# bedroom columns, the boundary frames, the 81-percentile wage tables, the
+# joint model and the per-tract summaries at the default budget.
+#
+#   python warmup.py [--server.port 8501 …]   # warm-up, then the app server
+#   python warmup.py --no-app                  # warm up, print the status, exit
+#
+# The warm-up runs beside the server in the same process, so sessions
+# that arrive meanwhile render what is ready and poll for the rest
+# (app.py).  Artifact builds can go to a process pool (LW_WARMUP_PROCESSES,
+# default 0 = threads); loads run on a thread pool (LW_WARMUP_THREADS).
+# With LW_HEALTH_PORT set, GET /readyz answers 200 once every task has
+# finished without error and 503 with the per-task status before that;
+# GET /healthz is 200 while the process is up.
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+THREADS = int(os.environ.get("LW_WARMUP_THREADS", "4"))
+PROCESSES = int(os.environ.get("LW_WARMUP_PROCESSES", "0"))
+HEALTH_PORT = os.environ.get("LW_HEALTH_PORT")
+POLL_SECONDS = 1.0             # how often a partially rendered page checks back
+
+
+# ── tasks ────────────────────────────────────────────────────────────
+# artifact builders are module-level so a process pool can pickle them
+def _grid_parquet(place):
+    from datasets import convert, parquet_path
+
+    if not parquet_path("grid", place=place).exists():
+        convert("grid", place=place)
+
+
+def _grid_polygons(place, zoom):
+    from datasets import dataset_source
+    from geometry import load_artifact, tolerance_for_zoom
+
+    load_artifact(dataset_source("grid", place), tolerance_for_zoom(zoom))
+
+
+def _boundary_payload(place, zoom):
+    from datasets import dataset_source
+    from geometry import load_boundary, tolerance_for_zoom
+
+    load_boundary(dataset_source("city_boundary", place), tolerance=tolerance_for_zoom(zoom))
+
+
+def _rent_table(place):
+    import rent_model
+
+    for bedrooms in rent_model.BEDROOM_SIZES:
+        rent_model.rent_cdf(bedrooms, place=place)
+
+
+def _tract_summaries(place, budget):
+    from datasets import RENT_COLUMNS
+    from zonal import tract_summary
+
+    for column in RENT_COLUMNS[:-1]:          # the app's bedroom options
+        tract_summary(column, float(budget), place)
+
+
+def _wage_tables(place):
+    from wage_cache import prewarm
+
+    prewarm(place=place)
+
+
+def _tileset(place, tileset):
+    from tiles import ensure_tileset
+
+    ensure_tileset(tileset, place)
+
+
+def place_tasks(place, tiles: bool = False) -> tuple:
+    """
+    ((key, fn, args) artifact tasks, (key, fn, args) load tasks) for one
+    place; keys are (what, place slug).
+    """
+    import loaders
+
+    zoom, slug = loaders.MAP_ZOOM, place.slug
+    disk = [(("grid_parquet", slug), _grid_parquet, (place,)),
+            (("grid_polygons", slug), _grid_polygons, (place, zoom)),
+            (("boundary_payload", slug), _boundary_payload, (place, zoom))]
+    load = [(("grid_layers", slug), loaders.grid_layers, (place, zoom)),
+            (("city_boundary", slug), loaders.city_boundary, (place, zoom)),
+            (("wage_tables", slug), _wage_tables, (place,)),
+            (("joint_model", slug), loaders.joint_for, (place,)),
+            (("rent_table", slug), _rent_table, (place,)),
+            (("tract_summaries", slug), _tract_summaries, (place, loaders.DEFAULT_BUDGET))]
+    if tiles:
+        from tiles import TILESETS
+
+        load += [(("tiles", slug, name), _tileset, (place, name)) for name in TILESETS]
+    return disk, load
+
+
+# ── runner ───────────────────────────────────────────────────────────
+class Warmup:
+    """
+    Runs the warm-up tasks of every scheduled place in the background and
+    keeps per-task state ("pending", "running", "done", "failed").
+    """
+
+    def __init__(self, threads: int = THREADS, processes: int = PROCESSES,
+                 tiles: bool = False):
+        self.tiles = tiles
+        self._threads = ThreadPoolExecutor(max_workers=max(1, threads),
+                                           thread_name_prefix="warmup")
+        # spawn: forking a process that already runs threads is unsafe
+        self._disk = (ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"))
+                      if processes > 0 else self._threads)
+        self._lock = threading.Lock()
+        self._tasks = {}          # key → {"state", "seconds", "error"}
+        self._places = set()
+
+    def warm_place(self, place) -> "Warmup":
+        """Schedule a place's tasks (once); returns immediately."""
+        with self._lock:
+            if place.slug in self._places:
+                return self
+            self._places.add(place.slug)
+            disk, load = place_tasks(place, self.tiles)
+            for key, _, _ in disk + load:
+                self._tasks[key] = {"state": "pending", "seconds": None, "error": None}
+        threading.Thread(target=self._run_place, args=(disk, load), daemon=True,
+                         name=f"warmup-{place.slug}").start()
+        return self
+
+    def _run_place(self, disk, load):
+        wait([self._submit(self._disk, *task) for task in disk])
+        wait([self._submit(self._threads, *task) for task in load])
+
+    def _submit(self, pool, key, fn, args):
+        self._set(key, state="running")
+        t0 = time.perf_counter()
+        future = pool.submit(fn, *args)
+
+        def finished(f):
+            err = f.exception()
+            self._set(key, state="failed" if err else "done",
+                      seconds=round(time.perf_counter() - t0, 3),
+                      error=None if err is None else f"{type(err).__name__}: {err}")
+        future.add_done_callback(finished)
+        return future
+
+    def _set(self, key, **fields):
+        with self._lock:
+            self._tasks[key].update(fields)
+
+    # -- state -------------------------------------------------------
+    def ready_for(self, *keys) -> bool:
+        """True when every key is finished (done or failed) or was never scheduled."""
+        with self._lock:
+            return all(self._tasks.get(k, {}).get("state", "done") in ("done", "failed")
+                       for k in keys)
+
+    @property
+    def finished(self) -> bool:
+        with self._lock:
+            return all(t["state"] in ("done", "failed") for t in self._tasks.values())
+
+    @property
+    def ready(self) -> bool:
+        """Readiness flag: every scheduled task done, none failed."""
+        with self._lock:
+            return all(t["state"] == "done" for t in self._tasks.values())
+
+    def status(self) -> dict:
+        with self._lock:
+            tasks = {f"{k[1]}: {' '.join(k[:1] + k[2:])}": dict(t)
+                     for k, t in self._tasks.items()}
+        done = sum(t["state"] in ("done", "failed") for t in tasks.values())
+        return {"ready": all(t["state"] == "done" for t in tasks.values()),
+                "done": done, "total": len(tasks), "tasks": tasks}
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until every scheduled task has finished; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.finished:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+
+_current = None
+_current_lock = threading.Lock()
+
+
+def start(places=None, **options) -> Warmup:
+    """
+    The process-wide Warmup, created on first call and warming `places`
+    (default: the registry's default place).  Later calls return it.
+    """
+    global _current
+    with _current_lock:
+        if _current is None:
+            from places import DEFAULT_PLACE, PLACES
+            from tiles import tiles_requested
+
+            options.setdefault("tiles", tiles_requested())
+            _current = Warmup(**options)
+            for place in places or [PLACES[DEFAULT_PLACE]]:
+                _current.warm_place(place)
+            if HEALTH_PORT:
+                serve_health(_current, int(HEALTH_PORT))
+        return _current
+
+
+# ── health endpoint ──────────────────────────────────────────────────
+def serve_health(warm: Warmup, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """GET /healthz (process up) and /readyz (warm-up finished) on a daemon thread."""
+
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/healthz":
+                code, body = 200, {"alive": True}
+            elif self.path == "/readyz":
+                body = warm.status()
+                code = 200 if body["ready"] else 503
+            else:
+                self.send_error(404)
+                return
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="health").start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Warm the app's caches in the background, then run the app server.")
+    parser.add_argument("--place", action="append", default=[],
+                        help="place slug or name to warm (repeatable; default Fort Worth)")
+    parser.add_argument("--no-app", action="store_true",
+                        help="wait for the warm-up, print its status and exit")
+    args, streamlit_args = parser.parse_known_args(argv)    # the rest go to `streamlit run`
+
+    from places import ensure_built, get_place
+
+    warm = start([ensure_built(get_place(p)) for p in args.place] or None)
+    if args.no_app:
+        warm.wait()
+        print(json.dumps(warm.status(), indent=2))
+        return 0 if warm.ready else 1
+
+    from streamlit.web import cli
+
+    # `streamlit run` serves from this process, so its sessions see the
+    # warmed caches
+    app = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    return cli.main(["run", app, *streamlit_args], standalone_mode=False)
+
+
+if __name__ == "__main__":
+    # run through the importable module, so app.py's `import warmup` sees
+    # the same process-wide Warmup
+    import warmup
+
+    sys.exit(warmup.main())
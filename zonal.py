@@ -0,0 +1,171 @@
+# zonal.py  ───────────────────────────────────────────────────────────
+# Affordability of grid cells aggregated per tract or per any polygon
+# layer (council districts, ZIP codes …).  Zones are precomputed once as
+# a cell ordering plus group offsets, so a summary is a handful of
+# np.add.reduceat calls and one sort, whatever the number of zones.
+# The grid-backed entry points take an optional `place` (places.Place).
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from datasets import read_attributes, read_dataset, source_key
+from living_wage import FAMILY_LABELS
+from shared_cache import CACHE
+
+GAP_QUANTILES = (0.25, 0.5, 0.75)
+
+
+@dataclass(frozen=True)
+class Zones:
+    """Cells grouped by zone: ``order[starts[z]:starts[z + 1]]`` are zone z's cells."""
+    labels: np.ndarray   # zone label, one per group
+    order: np.ndarray    # cell indices sorted by zone
+    starts: np.ndarray   # offset of each zone in `order` (reduceat indices)
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(np.append(self.starts, len(self.order)))
+
+
+def group_index(keys) -> Zones:
+    """Zones from one label per cell (e.g. the tract column)."""
+    keys = np.asarray(keys)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[len(keys) > 0, sorted_keys[1:] != sorted_keys[:-1]])
+    return Zones(sorted_keys[starts], order, starts)
+
+
+def polygon_zones(cell_geoms, zone_gdf, label_col: str) -> Zones:
+    """
+    Zones from a polygon layer: each cell joins the first polygon that
+    contains its representative point; cells outside every polygon are
+    left out.  `zone_gdf` must share the cells' CRS.
+    """
+    import shapely
+
+    points = shapely.point_on_surface(np.asarray(cell_geoms, dtype=object))
+    tree = shapely.STRtree(zone_gdf.geometry.values)
+    cell_idx, zone_idx = tree.query(points, predicate="within")
+    cell_idx, first = np.unique(cell_idx, return_index=True)
+    labels = zone_gdf[label_col].to_numpy()[zone_idx[first]]
+
+    zones = group_index(labels)
+    return Zones(zones.labels, cell_idx[zones.order], zones.starts)
+
+
+def zonal_summary(zones: Zones, rent, budget: float,
+                  quantiles=GAP_QUANTILES) -> pd.DataFrame:
+    """
+    Per zone: cells, cells with a rent estimate, affordable cells
+    (rent <= budget), affordable share and rent-gap quantiles.
+    """
+    rent = np.asarray(rent, dtype=float)[zones.order]
+    valid = rent > 0                                  # drops Census sentinels
+    gap = np.where(valid, rent - budget, np.inf)      # invalid sort last
+    starts, sizes = zones.starts, zones.sizes
+
+    n_valid = np.add.reduceat(valid.astype(np.int64), starts)
+    n_afford = np.add.reduceat((gap <= 0).astype(np.int64), starts)
+
+    # sort gaps inside every zone at once, then index each zone's quantiles
+    group = np.repeat(np.arange(len(starts)), sizes)
+    sorted_gap = gap[np.lexsort((gap, group))]
+    sorted_gap[np.isinf(sorted_gap)] = 0.0            # never selected below
+
+    out = pd.DataFrame({
+        "cells": sizes,
+        "cells_with_rent": n_valid,
+        "affordable_cells": n_afford,
+        "affordable_share": np.divide(n_afford, n_valid, out=np.full(len(starts), np.nan),
+                                      where=n_valid > 0),
+    }, index=pd.Index(zones.labels, name="zone"))
+    last = starts + np.maximum(n_valid - 1, 0)
+    for q in quantiles:
+        pos = starts + q * np.maximum(n_valid - 1, 0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, last)
+        frac = pos - lo
+        values = sorted_gap[lo] + (sorted_gap[hi] - sorted_gap[lo]) * frac
+        out[f"rent_gap_p{round(q * 100)}"] = np.where(n_valid > 0, values, np.nan)
+    return out
+
+
+# ── grid-backed, cached entry points (shared_cache.CACHE) ────────────
+def _key(what: str, place, *rest) -> tuple:
+    return (what, *source_key("grid", place), *rest)
+
+
+def _grid(place=None):
+    return CACHE.get_or_build(_key("grid_attributes", place),
+                              lambda: read_attributes("grid", place=place))
+
+
+def tract_zones(place=None) -> Zones:
+    def build():
+        grid = _grid(place)
+        return group_index((grid["county"] + grid["tract"]).to_numpy())
+    return CACHE.get_or_build(_key("tract_zones", place), build)
+
+
+def tract_summary(bedroom_col: str, budget: float, place=None) -> pd.DataFrame:
+    """
+    Per-tract summary for one bedroom column and budget, indexed by
+    (county, tract): tract codes repeat across counties.  Cached; a copy
+    is returned, so it is safe to mutate.
+    """
+    def build():
+        summary = zonal_summary(tract_zones(place), _grid(place)[bedroom_col].to_numpy(), budget)
+        labels = summary.index.astype(str)            # county + tract
+        summary.index = pd.MultiIndex.from_arrays(
+            [labels.str.slice(0, 3), labels.str.slice(3)], names=["county", "tract"])
+        return summary
+    return CACHE.get_or_build(_key("tract_summary", place, bedroom_col, float(budget)),
+                              build).copy()
+
+
+def family_summaries(budgets: dict, columns, place=None) -> pd.DataFrame:
+    """
+    Tidy per-tract summary for every family type × bedroom column, from
+    `budgets` = {family label: monthly housing budget}.
+    """
+    parts = [tract_summary(col, float(budgets[fam]), place).assign(family=fam, bedroom=col)
+             for fam in FAMILY_LABELS for col in columns]
+    return pd.concat(parts).reset_index().set_index(["family", "bedroom", "county", "tract"])
+
+
+def layer_fingerprint(zone_gdf, label_col: str) -> str:
+    """Short content hash of a polygon layer: CRS, labels and geometry."""
+    import shapely
+
+    digest = hashlib.sha1(str(zone_gdf.crs).encode())
+    digest.update(pd.util.hash_pandas_object(zone_gdf[label_col].astype(str),
+                                             index=False).to_numpy().tobytes())
+    digest.update(b"".join(shapely.to_wkb(zone_gdf.geometry.values)))
+    return digest.hexdigest()[:12]
+
+
+def layer_zones(zone_gdf, label_col: str, place=None, fingerprint: str = None) -> Zones:
+    """Grid cells grouped by a polygon layer, computed once per (layer, place)."""
+    def build():
+        grid = read_dataset("grid", place=place)
+        return polygon_zones(grid.geometry.values, zone_gdf.to_crs(grid.crs), label_col)
+    fingerprint = fingerprint or layer_fingerprint(zone_gdf, label_col)
+    return CACHE.get_or_build(_key("layer_zones", place, fingerprint, label_col), build)
+
+
+def layer_summary(zone_gdf, label_col: str, bedroom_col: str, budget: float,
+                  place=None) -> pd.DataFrame:
+    """
+    Summary over any polygon layer (reprojected to the grid's CRS), cached
+    per (layer, bedroom column, budget); a copy is returned.
+    """
+    fingerprint = layer_fingerprint(zone_gdf, label_col)
+
+    def build():
+        zones = layer_zones(zone_gdf, label_col, place, fingerprint)
+        return zonal_summary(zones, _grid(place)[bedroom_col].to_numpy(), budget)
+    key = _key("layer_summary", place, fingerprint, label_col, bedroom_col, float(budget))
+    return CACHE.get_or_build(key, build).copy()